@@ -0,0 +1,255 @@
+import argparse
+import csv
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+from scipy import sparse
+from scipy.optimize import linprog
+
+from model import ProductionModel
+from sensitivity import analyze
+from transport import TransportationProblem
+
+# Плотная матрица ограничений строится, только если занимает не больше этого объёма
+DENSE_LIMIT_MB = 512
+
+
+def random_transport(m, n, seed=0):
+    """Случайная сбалансированная транспортная задача размера m x n."""
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(1, 100, (m, n))
+    supply = rng.uniform(10, 100, m)
+    demand = rng.uniform(1, 10, n)
+    demand *= supply.sum() / demand.sum()
+    return cost, supply, demand
+
+
+def random_production(m, n, seed=0):
+    """Случайная задача производства: m ресурсов, n продуктов."""
+    return ProductionModel(*random_production_data(m, n, seed))
+
+
+def random_production_data(m, n, seed=0):
+    """Массивы (profit, usage, capacity) случайной задачи производства."""
+    rng = np.random.default_rng(seed)
+    usage = rng.uniform(0, 10, (m, n)) * (rng.random((m, n)) < 0.3)
+    usage[rng.integers(0, m, n), np.arange(n)] += 1    # каждый продукт тратит хотя бы один ресурс
+    profit = rng.uniform(1, 100, n)
+    capacity = rng.uniform(0.5, 2, m) * usage.sum(axis=1) / 10
+    return profit, usage, capacity
+
+
+def dense_constraints(m, n):
+    """Плотная матрица ограничений транспортной задачи, как в исходном second.py."""
+    A_eq = np.zeros((m + n, m * n))
+    for i in range(m):
+        A_eq[i, i * n:(i + 1) * n] = 1
+    for j in range(n):
+        A_eq[m + j, j::n] = 1
+    return A_eq
+
+
+def solve_dense(cost, supply, demand):
+    """Решение в исходном виде second.py: плотная A_eq и общий linprog."""
+    res = linprog(cost.ravel(), A_eq=dense_constraints(*cost.shape), b_eq=np.concatenate([supply, demand]),
+                  bounds=(0, None), method='highs')
+    return res.fun
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return time.perf_counter() - start, value
+
+
+def bench_transport(sizes, seed=0):
+    """Сравнение плотного linprog, разреженного HiGHS и метода потенциалов."""
+    print(f"{'m x n':>12} {'dense, с':>10} {'sparse, с':>10} {'network, с':>11} {'стоимость':>14}")
+    for m, n in sizes:
+        cost, supply, demand = random_transport(m, n, seed)
+        problem = TransportationProblem(cost, supply, demand)
+
+        dense_mb = (m + n) * m * n * 8 / 2**20
+        if dense_mb <= DENSE_LIMIT_MB:
+            t_dense, _ = _timed(solve_dense, cost, supply, demand)
+            dense = f"{t_dense:10.3f}"
+        else:
+            dense = f"{'-':>10}"
+
+        t_sparse, sparse_result = _timed(problem.solve, 'highs')
+        t_network, network_result = _timed(problem.solve, 'network')
+        assert np.isclose(sparse_result.cost, network_result.cost)
+        print(f"{f'{m} x {n}':>12} {dense} {t_sparse:10.3f} {t_network:11.3f} {network_result.cost:14.2f}")
+
+
+def bench_integer(sizes, time_limit=60, seed=0):
+    """
+    Цена точности: LP с округлением вниз против целочисленной задачи.
+    Потеря округления - насколько прибыль округлённого плана ниже
+    целочисленного оптимума (или лучшего плана, найденного за time_limit).
+    """
+    print(f"{'m x n':>12} {'LP, с':>8} {'MILP, с':>9} {'статус':>7} {'разрыв':>8} {'потеря округления':>18}")
+    for m, n in sizes:
+        model = random_production(m, n, seed)
+        t_lp, lp = _timed(model.solve)
+        rounded = model.round_down(lp)
+        t_mip, exact = _timed(lambda: model.solve_integer(time_limit=time_limit))
+        loss = (exact.profit - rounded.profit) / max(abs(exact.profit), 1e-9)
+        print(f"{f'{m} x {n}':>12} {t_lp:8.3f} {t_mip:9.3f} {exact.status:7d} "
+              f"{exact.mip_gap or 0:8.2%} {loss:18.4%}")
+
+
+def _measure(func, *args, repeat=1):
+    """
+    Лучшее время из `repeat` запусков и пик памяти отдельного запуска под tracemalloc.
+    tracemalloc видит память NumPy/SciPy, но не внутренние буферы HiGHS.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        seconds, value = _timed(func, *args)
+        best = min(best, seconds)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2**20, value
+
+
+def _production_stages(data, layout, method):
+    profit, usage, capacity = data
+
+    def build():
+        return ProductionModel(profit, sparse.csr_matrix(usage) if layout == 'sparse' else usage, capacity)
+
+    def solve(model):
+        return model.solve(method=method)
+
+    def report(model, result):
+        return analyze(model, result)
+
+    return build, solve, report
+
+
+def _transport_stages(data, layout, method):
+    cost, supply, demand = data
+
+    def build():
+        problem = TransportationProblem(cost, supply, demand)
+        A_eq = problem.constraint_matrix()
+        return problem, A_eq.toarray() if layout == 'dense' else A_eq
+
+    def solve(built):
+        problem, A_eq = built
+        return problem._solve_highs(method, A_eq)
+
+    def report(built, solution):
+        return built[0]._result(*solution)
+
+    return build, solve, report
+
+
+def bench_suite(production_sizes, transport_sizes, methods=('highs-ds', 'highs-ipm'),
+                layouts=('dense', 'sparse'), repeat=1, seed=0):
+    """
+    Замеры этапов решения на случайных задачах растущего размера.
+    Для каждой задачи, вида матрицы (dense / sparse) и метода HiGHS отдельно
+    измеряются построение модели, решение и отчёт (анализ чувствительности
+    для производства, потенциалы и оценки для перевозок): время в секундах
+    и пик выделенной памяти в МБ. Возвращает список записей.
+    """
+    cases = [('production', size, random_production_data(*size, seed), _production_stages)
+             for size in production_sizes]
+    cases += [('transport', size, random_transport(*size, seed), _transport_stages)
+              for size in transport_sizes]
+
+    records = []
+    print(f"{'задача':>10} {'m x n':>11} {'матрица':>7} {'метод':>9} "
+          f"{'build, с':>9} {'solve, с':>9} {'report, с':>10} {'пик, МБ':>8} {'значение':>14}")
+    for kind, (m, n), data, stages in cases:
+        for layout in layouts:
+            if layout == 'dense' and kind == 'transport' and (m + n) * m * n * 8 / 2**20 > DENSE_LIMIT_MB:
+                continue
+            for method in methods:
+                build, solve, report = stages(data, layout, method)
+                t_build, mb_build, built = _measure(build, repeat=repeat)
+                t_solve, mb_solve, solution = _measure(solve, built, repeat=repeat)
+                t_report, mb_report, result = _measure(report, built, solution, repeat=repeat)
+                value = result.result.profit if kind == 'production' else result.cost
+                records.append({'problem': kind, 'm': m, 'n': n, 'layout': layout, 'method': method,
+                                'build_s': t_build, 'solve_s': t_solve, 'report_s': t_report,
+                                'build_mb': mb_build, 'solve_mb': mb_solve, 'report_mb': mb_report,
+                                'objective': value})
+                print(f"{kind:>10} {f'{m} x {n}':>11} {layout:>7} {method:>9} {t_build:9.3f} {t_solve:9.3f} "
+                      f"{t_report:10.3f} {max(mb_build, mb_solve, mb_report):8.1f} {value:14.2f}")
+    return records
+
+
+def write_results(records, path, seed=0):
+    """
+    Записать результаты в JSON (с описанием окружения) или CSV - по расширению файла.
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+        return
+    meta = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seed': seed,
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'scipy': scipy.__version__, 'machine': platform.machine()}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': records}, f, ensure_ascii=False, indent=2)
+
+
+def _size(text):
+    m, n = text.lower().split('x')
+    return int(m), int(n)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки решателей lin_prog")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    transport = commands.add_parser('transport', help="транспортная задача: dense / sparse / network")
+    transport.add_argument('--sizes', type=_size, nargs='+',
+                           default=[(10, 30), (30, 100), (50, 500), (100, 1000), (200, 2000)],
+                           help="размеры задач, например 100x1000")
+
+    integer = commands.add_parser('integer', help="целочисленный план против округлённого LP")
+    integer.add_argument('--sizes', type=_size, nargs='+',
+                         default=[(10, 100), (50, 1000), (200, 10000)],
+                         help="число ресурсов x число продуктов, например 200x10000")
+    integer.add_argument('--time-limit', type=float, default=60)
+
+    suite = commands.add_parser('suite', help="этапы build / solve / report, dense и sparse, симплекс и IPM")
+    suite.add_argument('--production', type=_size, nargs='*',
+                       default=[(10, 100), (50, 1000), (200, 5000)],
+                       help="размеры задач производства (ресурсы x продукты)")
+    suite.add_argument('--transport', type=_size, nargs='*',
+                       default=[(10, 30), (50, 200), (100, 1000)],
+                       help="размеры транспортных задач")
+    suite.add_argument('--methods', nargs='+', default=['highs-ds', 'highs-ipm'],
+                       choices=['highs', 'highs-ds', 'highs-ipm'])
+    suite.add_argument('--layouts', nargs='+', default=['dense', 'sparse'], choices=['dense', 'sparse'])
+    suite.add_argument('--repeat', type=int, default=3, help="число повторов; берётся лучшее время")
+    suite.add_argument('--output', help="файл результатов: .json или .csv")
+
+    for command in (transport, integer, suite):
+        command.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'transport':
+        bench_transport(args.sizes, args.seed)
+    elif args.command == 'integer':
+        bench_integer(args.sizes, args.time_limit, args.seed)
+    else:
+        records = bench_suite(args.production, args.transport, args.methods, args.layouts,
+                              args.repeat, args.seed)
+        if args.output:
+            write_results(records, args.output, args.seed)
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+TOL = 1e-9
+
+
+@dataclass
+class FeasibleRegion:
+    """
+    Допустимая область двумерной задачи A @ x <= b.
+    Ограничения с номерами 0..m-1 - строки A, далее (если добавлены)
+    x1 >= 0, x2 >= 0 и ограничивающий прямоугольник.
+    """
+    A: np.ndarray
+    b: np.ndarray
+    vertices: np.ndarray   # (k, 2) вершины в порядке обхода против часовой стрелки
+    redundant: np.ndarray  # (m_total,) ограничение можно убрать, не изменив область
+
+    def active(self, point, tol=TOL):
+        """Номера ограничений, выполняющихся на равенство в точке `point`."""
+        scale = np.maximum(1.0, np.abs(self.b))
+        return np.flatnonzero(np.abs(self.A @ np.asarray(point, dtype=float) - self.b) <= tol * 1e3 * scale)
+
+    @property
+    def is_empty(self):
+        return len(self.vertices) == 0
+
+
+def feasible_region(A, b, nonnegative=True, bound=None):
+    """
+    Найти вершины многоугольника {x : A @ x <= b} на плоскости.
+    - **nonnegative**: добавить ограничения x1 >= 0, x2 >= 0
+    - **bound**: (x1_max, x2_max) - обрезать неограниченную область прямоугольником
+    Пересечения всех пар граничных прямых вычисляются одной векторной
+    операцией (правило Крамера), после чего остаются точки, удовлетворяющие
+    всем ограничениям.
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=float))
+    b = np.asarray(b, dtype=float)
+    if A.shape[1] != 2:
+        raise ValueError(f"Ожидается задача с двумя переменными, получено {A.shape[1]}")
+    if nonnegative:
+        A = np.vstack([A, -np.eye(2)])
+        b = np.concatenate([b, np.zeros(2)])
+    if bound is not None:
+        A = np.vstack([A, np.eye(2)])
+        b = np.concatenate([b, np.asarray(bound, dtype=float)])
+
+    # Все пары прямых a_i @ x = b_i, a_j @ x = b_j
+    i, j = np.triu_indices(len(A), k=1)
+    det = A[i, 0] * A[j, 1] - A[i, 1] * A[j, 0]
+    ok = np.abs(det) > TOL
+    i, j, det = i[ok], j[ok], det[ok]
+    points = np.column_stack([(b[i] * A[j, 1] - A[i, 1] * b[j]) / det,
+                              (A[i, 0] * b[j] - b[i] * A[j, 0]) / det])
+
+    scale = np.maximum(1.0, np.abs(b))
+    inside = ((points @ A.T - b) <= TOL * 1e3 * scale).all(axis=1)
+    vertices = _unique(points[inside])
+    if len(vertices) > 2:
+        center = vertices.mean(axis=0)
+        angle = np.arctan2(vertices[:, 1] - center[1], vertices[:, 0] - center[0])
+        vertices = vertices[np.argsort(angle)]
+
+    return FeasibleRegion(A, b, vertices, _redundant(A, b, vertices))
+
+
+def _unique(points):
+    if len(points) == 0:
+        return points.reshape(0, 2)
+    scale = max(1.0, np.abs(points).max())
+    _, index = np.unique(np.round(points / scale, 9), axis=0, return_index=True)
+    # + 0.0 убирает отрицательные нули
+    return points[np.sort(index)] + 0.0
+
+
+def _redundant(A, b, vertices):
+    """
+    Ограничение существенно, если на его прямой лежат две разные вершины
+    (оно образует сторону многоугольника). Из совпадающих ограничений
+    существенным считается только первое.
+    """
+    scale = np.maximum(1.0, np.abs(b))
+    tight = np.abs(vertices @ A.T - b) <= TOL * 1e3 * scale
+    redundant = tight.sum(axis=0) < 2
+
+    norm = np.linalg.norm(A, axis=1)
+    norm[norm == 0] = 1.0
+    normalized = np.round(np.column_stack([A, b]) / norm[:, None], 9)
+    _, first = np.unique(normalized, axis=0, return_index=True)
+    duplicate = np.ones(len(A), dtype=bool)
+    duplicate[first] = False
+    return redundant | duplicate
@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+# Сколько сценариев объединяется в одну блочно-диагональную задачу
+BATCH_CHUNK = 500
+
+
+@dataclass
+class ProductionResult:
+    """Решение одной задачи планирования производства."""
+    x: np.ndarray          # оптимальный план выпуска
+    profit: float          # максимальная прибыль
+    used: np.ndarray       # израсходовано каждого ресурса
+    slack: np.ndarray      # остаток каждого ресурса
+    status: int            # код статуса linprog (0 - оптимум найден)
+    message: str
+    shadow_prices: np.ndarray = None   # теневые цены ресурсов (двойственные переменные)
+    reduced_costs: np.ndarray = None   # приведённые оценки продуктов (<= 0 в оптимуме)
+    mip_gap: float = None              # относительный разрыв до верхней оценки (целочисленный режим)
+
+    @property
+    def success(self):
+        return self.status == 0
+
+
+@dataclass
+class BatchResult:
+    """Решения набора вариантов плана: по строке на сценарий."""
+    x: np.ndarray          # (k, n)
+    profit: np.ndarray     # (k,)
+    used: np.ndarray       # (k, m)
+    slack: np.ndarray      # (k, m)
+    status: np.ndarray     # (k,)
+
+    @property
+    def success(self):
+        return self.status == 0
+
+    def __len__(self):
+        return len(self.profit)
+
+
+class ProductionModel:
+    """
+    Задача оптимизации производства:
+        profit @ x -> max,  usage @ x <= capacity,  x >= 0.
+    - **profit**: прибыль с единицы каждого продукта, форма (n,)
+    - **usage**: расход ресурсов на единицу продукта, форма (m, n);
+      плотный массив или разреженная матрица scipy.sparse
+    - **capacity**: запас каждого ресурса, форма (m,)
+    """
+
+    def __init__(self, profit, usage, capacity, product_names=None, resource_names=None):
+        self.profit = np.asarray(profit, dtype=float)
+        if sparse.issparse(usage):
+            self.usage = usage.tocsr().astype(float, copy=False)
+        else:
+            self.usage = np.atleast_2d(np.asarray(usage, dtype=float))
+        self.capacity = np.asarray(capacity, dtype=float)
+
+        m, n = self.usage.shape
+        if self.profit.shape != (n,):
+            raise ValueError(f"profit должен иметь форму ({n},), получено {self.profit.shape}")
+        if self.capacity.shape != (m,):
+            raise ValueError(f"capacity должен иметь форму ({m},), получено {self.capacity.shape}")
+
+        self.product_names = list(product_names) if product_names else [f"x_{j + 1}" for j in range(n)]
+        self.resource_names = list(resource_names) if resource_names else [f"Ресурс {i + 1}" for i in range(m)]
+
+    @property
+    def n_products(self):
+        return self.usage.shape[1]
+
+    @property
+    def n_resources(self):
+        return self.usage.shape[0]
+
+    def dense_usage(self):
+        """Матрица расхода в виде плотного массива."""
+        return self.usage.toarray() if sparse.issparse(self.usage) else self.usage
+
+    def _linprog(self, profit, capacity, method='highs'):
+        # linprog минимизирует, поэтому меняем знак целевой функции
+        return linprog(-profit, A_ub=self.usage, b_ub=capacity,
+                       bounds=(0, None), method=method)
+
+    def solve(self, profit=None, capacity=None, method='highs'):
+        """
+        Решить задачу для одного варианта плана.
+        Если profit/capacity не переданы, используются значения модели.
+        - **method**: 'highs' (выбор HiGHS), 'highs-ds' - двойственный симплекс,
+          'highs-ipm' - метод внутренней точки
+        """
+        profit = self.profit if profit is None else np.asarray(profit, dtype=float)
+        capacity = self.capacity if capacity is None else np.asarray(capacity, dtype=float)
+        res = self._linprog(profit, capacity, method)
+        if res.x is None:
+            x = np.full(self.n_products, np.nan)
+            return ProductionResult(x, np.nan, np.full(self.n_resources, np.nan),
+                                    np.full(self.n_resources, np.nan), res.status, res.message)
+        used = self.usage @ res.x
+        # Множители HiGHS относятся к задаче минимизации -profit,
+        # поэтому для прибыли берём их с обратным знаком
+        return ProductionResult(res.x, -res.fun, used, capacity - used, res.status, res.message,
+                                shadow_prices=-res.ineqlin.marginals,
+                                reduced_costs=-res.lower.marginals)
+
+    def solve_integer(self, profit=None, capacity=None, time_limit=None, gap=None):
+        """
+        Решить задачу в целых числах (выпуск - целое число изделий).
+        Используется метод ветвей и границ HiGHS (scipy.optimize.milp):
+        оценки узлов дают LP-релаксации, узлы хуже найденного плана отсекаются.
+        - **time_limit**: ограничение времени в секундах
+        - **gap**: допустимый относительный разрыв между планом и верхней оценкой
+        При срабатывании ограничения возвращается лучший найденный план
+        со статусом 1 и фактическим разрывом в mip_gap.
+        """
+        profit = self.profit if profit is None else np.asarray(profit, dtype=float)
+        capacity = self.capacity if capacity is None else np.asarray(capacity, dtype=float)
+        options = {}
+        if time_limit is not None:
+            options['time_limit'] = time_limit
+        if gap is not None:
+            options['mip_rel_gap'] = gap
+
+        res = milp(-profit, constraints=LinearConstraint(self.usage, -np.inf, capacity),
+                   integrality=np.ones(self.n_products), bounds=Bounds(0, np.inf), options=options)
+        if res.x is None:
+            return ProductionResult(np.full(self.n_products, np.nan), np.nan,
+                                    np.full(self.n_resources, np.nan), np.full(self.n_resources, np.nan),
+                                    res.status, res.message)
+        x = np.round(res.x) + 0.0
+        used = self.usage @ x
+        return ProductionResult(x, float(profit @ x), used, capacity - used, res.status, res.message,
+                                mip_gap=getattr(res, 'mip_gap', None))
+
+    def round_down(self, result, profit=None, capacity=None):
+        """
+        Целочисленный план округлением LP-решения вниз.
+        При неотрицательном расходе ресурсов он всегда допустим,
+        но может быть хуже точного целочисленного решения.
+        Если result получен через solve(profit=..., capacity=...),
+        те же profit/capacity нужно передать и сюда.
+        """
+        profit = self.profit if profit is None else np.asarray(profit, dtype=float)
+        capacity = self.capacity if capacity is None else np.asarray(capacity, dtype=float)
+        x = np.floor(result.x + 1e-9)
+        used = self.usage @ x
+        return ProductionResult(x, float(profit @ x), used, capacity - used,
+                                result.status, result.message)
+
+    def solve_batch(self, profits=None, capacities=None, chunk=BATCH_CHUNK):
+        """
+        Решить сразу много вариантов плана.
+        - **profits**: цены по сценариям, форма (k, n) или (n,)
+        - **capacities**: запасы ресурсов по сценариям, форма (k, m) или (m,)
+        Сценарии независимы, поэтому пачка из `chunk` сценариев собирается
+        в одну блочно-диагональную разреженную задачу и решается одним вызовом HiGHS.
+        Если пачка не решилась (недопустимый или неограниченный сценарий),
+        её сценарии решаются по отдельности, чтобы получить статус каждого.
+        """
+        profits = np.atleast_2d(self.profit if profits is None else np.asarray(profits, dtype=float))
+        capacities = np.atleast_2d(self.capacity if capacities is None else np.asarray(capacities, dtype=float))
+        k = max(len(profits), len(capacities))
+        profits = np.broadcast_to(profits, (k, self.n_products))
+        capacities = np.broadcast_to(capacities, (k, self.n_resources))
+
+        x = np.full((k, self.n_products), np.nan)
+        status = np.zeros(k, dtype=int)
+
+        for start in range(0, k, chunk):
+            stop = min(start + chunk, k)
+            size = stop - start
+            A = sparse.kron(sparse.identity(size, format='csr'), sparse.csr_matrix(self.usage), format='csr')
+            res = linprog(-profits[start:stop].ravel(), A_ub=A, b_ub=capacities[start:stop].ravel(),
+                          bounds=(0, None), method='highs')
+            if res.status == 0:
+                x[start:stop] = res.x.reshape(size, self.n_products)
+                continue
+            for s in range(start, stop):
+                single = self._linprog(profits[s], capacities[s])
+                status[s] = single.status
+                if single.x is not None:
+                    x[s] = single.x
+
+        used = x @ self.usage.T
+        profit = np.einsum('kn,kn->k', profits, x)
+        return BatchResult(x, profit, used, capacities - used, status)
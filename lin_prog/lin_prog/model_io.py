@@ -0,0 +1,188 @@
+"""
+Хранение моделей lin_prog на диске.
+
+Столбцовый формат - каталог с файлом meta.json (тип модели, имена,
+скалярные параметры) и отдельным .npy-файлом для каждого массива.
+Матрица расхода ресурсов хранится в виде CSR (data, indices, indptr),
+поэтому при загрузке массивы отображаются в память (mmap) и разреженная
+матрица собирается без копирования и без промежуточных списков Python.
+
+Дополнительно поддерживается импорт задач производства из MPS-файлов.
+"""
+import json
+import os
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from model import ProductionModel
+from transport import TransportationProblem
+
+FORMAT_VERSION = 1
+
+# Типы границ MPS со значением и без него
+BOUND_KINDS_WITH_VALUE = {'UP', 'LO', 'FX', 'LI', 'UI', 'SC'}
+BOUND_KINDS_WITHOUT_VALUE = {'FR', 'MI', 'PL', 'BV'}
+
+
+def save_model(model, path):
+    """Сохранить ProductionModel или TransportationProblem в каталог `path`."""
+    os.makedirs(path, exist_ok=True)
+    if isinstance(model, ProductionModel):
+        usage = sparse.csr_matrix(model.usage)
+        meta = {'kind': 'production', 'shape': list(usage.shape),
+                'product_names': model.product_names, 'resource_names': model.resource_names}
+        arrays = {'profit': model.profit, 'capacity': model.capacity,
+                  'usage_data': usage.data, 'usage_indices': usage.indices, 'usage_indptr': usage.indptr}
+    elif isinstance(model, TransportationProblem):
+        m, n = model.n_sources, model.n_sinks
+        meta = {'kind': 'transport', 'source_names': model.source_names, 'sink_names': model.sink_names,
+                'shortage_cost': float(model.shortage_cost), 'surplus_cost': float(model.surplus_cost)}
+        arrays = {'cost': model.cost[:m, :n], 'supply': model.supply[:m], 'demand': model.demand[:n]}
+    else:
+        raise TypeError(f"Неизвестный тип модели: {type(model).__name__}")
+
+    meta['version'] = FORMAT_VERSION
+    for name, values in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(values))
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def load_model(path, mmap=True):
+    """
+    Загрузить модель из каталога, созданного save_model.
+    При mmap=True массивы не читаются в память целиком, а отображаются из файлов.
+    """
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата модели: {meta.get('version')}")
+
+    def column(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if mmap else None)
+
+    if meta['kind'] == 'production':
+        usage = sparse.csr_matrix((column('usage_data'), column('usage_indices'), column('usage_indptr')),
+                                  shape=tuple(meta['shape']), copy=False)
+        return ProductionModel(column('profit'), usage, column('capacity'),
+                               product_names=meta['product_names'], resource_names=meta['resource_names'])
+    if meta['kind'] == 'transport':
+        return TransportationProblem(column('cost'), column('supply'), column('demand'),
+                                     source_names=meta['source_names'], sink_names=meta['sink_names'],
+                                     shortage_cost=meta['shortage_cost'], surplus_cost=meta['surplus_cost'])
+    raise ValueError(f"Неизвестный тип модели: {meta['kind']}")
+
+
+def read_mps(path):
+    """
+    Прочитать задачу производства из MPS-файла (фиксированный или свободный формат).
+    Ограничения типа L переходят в ресурсы как есть, G - со сменой знака,
+    E - парой неравенств; верхние границы UP становятся отдельными ресурсами.
+    Файл читается построчно, коэффициенты накапливаются в типизированных
+    массивах, матрица расхода собирается сразу в разреженном виде.
+    Задача на минимум приводится к максимизации прибыли сменой знака.
+    """
+    row_index, row_sense, row_names = {}, [], []
+    col_index, col_names = {}, []
+    objective = None
+    maximize = False
+    rows, cols, values = array('q'), array('q'), array('d')
+    profit, rhs = {}, {}
+    upper = {}
+    section = None
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('*'):
+                continue
+            if not line[0].isspace():
+                words = line.split()
+                section = words[0].upper()
+                if section == 'OBJSENSE' and len(words) > 1:
+                    maximize = words[1].upper() in ('MAX', 'MAXIMIZE')
+                if section == 'ENDATA':
+                    break
+                continue
+
+            words = line.split()
+            if section == 'OBJSENSE':
+                maximize = words[0].upper() in ('MAX', 'MAXIMIZE')
+            elif section == 'ROWS':
+                sense, name = words[0].upper(), words[1]
+                if sense == 'N':
+                    objective = objective or name
+                    continue
+                row_index[name] = len(row_names)
+                row_names.append(name)
+                row_sense.append(sense)
+            elif section == 'COLUMNS':
+                if 'MARKER' in words:
+                    raise ValueError("Целочисленные маркеры MPS не поддерживаются")
+                name = words[0]
+                j = col_index.setdefault(name, len(col_names))
+                if j == len(col_names):
+                    col_names.append(name)
+                for row, value in zip(words[1::2], words[2::2]):
+                    if row == objective:
+                        profit[j] = float(value)
+                    else:
+                        rows.append(row_index[row])
+                        cols.append(j)
+                        values.append(float(value))
+            elif section == 'RHS':
+                pairs = words[1:] if len(words) % 2 else words
+                for row, value in zip(pairs[0::2], pairs[1::2]):
+                    if row != objective:
+                        rhs[row_index[row]] = float(value)
+            elif section == 'BOUNDS':
+                # Строка: тип [имя набора] столбец [значение]; у FR, MI, PL, BV значения нет
+                kind = words[0].upper()
+                if kind in BOUND_KINDS_WITH_VALUE:
+                    name, value = words[-2], float(words[-1])
+                elif kind in BOUND_KINDS_WITHOUT_VALUE:
+                    name, value = words[-1], None
+                else:
+                    raise ValueError(f"Неизвестный тип границы в MPS: {kind}")
+                if name not in col_index:
+                    raise ValueError(f"Граница {kind} для неизвестного столбца {name}")
+                j = col_index[name]
+                if kind == 'UP' or (kind == 'FX' and value == 0):
+                    upper[j] = value
+                elif not (kind == 'PL' or (kind == 'LO' and value == 0)):
+                    raise ValueError(f"Граница {kind} для {name} не поддерживается: "
+                                     f"допустимы только переменные x >= 0 (UP, PL, LO 0, FX 0)")
+            elif section == 'RANGES':
+                raise ValueError("Секция RANGES не поддерживается")
+
+    m, n = len(row_names), len(col_names)
+    sense = np.array(row_sense)
+    rows = np.frombuffer(rows, dtype=np.int64)
+    cols = np.frombuffer(cols, dtype=np.int64)
+    values = np.frombuffer(values, dtype=float)
+    b = np.zeros(m)
+    b[list(rhs)] = list(rhs.values())
+
+    # G: a @ x >= b  =>  -a @ x <= -b;  E - пара неравенств <= и >=
+    sign = np.where(sense == 'G', -1.0, 1.0)
+    usage = sparse.csr_matrix((values * sign[rows], (rows, cols)), shape=(m, n))
+    capacity = b * sign
+    names = list(row_names)
+    equal = np.flatnonzero(sense == 'E')
+    if len(equal):
+        usage = sparse.vstack([usage, -usage[equal]], format='csr')
+        capacity = np.concatenate([capacity, -b[equal]])
+        names += [f"{row_names[i]} (>=)" for i in equal]
+    if upper:
+        index = np.array(list(upper))
+        bounds = sparse.csr_matrix((np.ones(len(index)), (np.arange(len(index)), index)),
+                                   shape=(len(index), n))
+        usage = sparse.vstack([usage, bounds], format='csr')
+        capacity = np.concatenate([capacity, list(upper.values())])
+        names += [f"UP {col_names[j]}" for j in index]
+
+    c = np.zeros(n)
+    c[list(profit)] = list(profit.values())
+    return ProductionModel(c if maximize else -c, usage, capacity,
+                           product_names=col_names, resource_names=names)
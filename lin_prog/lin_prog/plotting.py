@@ -0,0 +1,168 @@
+"""
+Построение графиков для задач lin_prog.
+Модуль импортируется только при необходимости нарисовать график:
+решение задач не зависит от matplotlib. Рисунки строятся на объекте
+Figure без pyplot и сохраняются через Agg, поэтому работают на серверах
+без графической оболочки; pyplot загружается лишь для показа на экране.
+"""
+import io
+import os
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.patches import FancyArrowPatch, FancyBboxPatch, Polygon
+
+from geometry import feasible_region
+
+
+def production_figure(model, result, levels=(), figure=None):
+    """
+    Геометрическое представление задачи производства с двумя продуктами.
+    - **levels**: уровни прибыли для изопрофит (оптимальный добавляется всегда)
+    """
+    figure = figure or Figure(figsize=(10, 8))
+    ax = figure.subplots()
+
+    usage = model.dense_usage()
+    region = feasible_region(usage, model.capacity)
+    # Точки пересечения прямых ограничений с осями задают масштаб, если вершин не хватает
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intercepts = model.capacity[:, None] / usage
+    intercepts = np.where(np.isfinite(intercepts) & (intercepts > 0), intercepts, 0)
+    if region.is_empty:
+        # Ограничения несовместны: масштаб осей только по пересечениям с осями
+        x_max = y_max = intercepts.max(initial=0) * 1.1 or 1.0
+    else:
+        x_max = (region.vertices[:, 0].max() or intercepts[:, 0].max(initial=0) or 1.0) * 1.1
+        y_max = (region.vertices[:, 1].max() or intercepts[:, 1].max(initial=0) or x_max) * 1.2
+        # Неограниченная область обрезается прямоугольником осей; без bound её
+        # уходящие в бесконечность стороны потерялись бы. Ограниченную область
+        # прямоугольник не меняет: он больше самой дальней вершины
+        region = feasible_region(usage, model.capacity, bound=(x_max, y_max))
+    x1 = np.array([0, x_max])
+
+    # Прямые ограничений: a1*x1 + a2*x2 = b  =>  x2 = (b - a1*x1) / a2,
+    # при a2 = 0 - вертикальная прямая x1 = b / a1
+    colors = ['r', 'g', 'b', 'c', 'm', 'y']
+    for k, ((a1, a2), b, name) in enumerate(zip(usage, model.capacity, model.resource_names)):
+        style = dict(color=colors[k % len(colors)], linewidth=2,
+                     label=f'{name}: ${a1:g}x_1 + {a2:g}x_2 \\leq {b:g}$')
+        if a2 != 0:
+            ax.plot(x1, (b - a1*x1) / a2, **style)
+        elif a1 != 0:
+            ax.axvline(b / a1, **style)
+
+    # Закрашивание допустимой области
+    if not region.is_empty:
+        polygon = Polygon(region.vertices, alpha=0.2, color='yellow', label='Допустимая область')
+        ax.add_patch(polygon)
+
+    if result.success:
+        # Оптимальная точка (из решения)
+        optimal_x1, optimal_x2 = result.x
+        ax.plot(optimal_x1, optimal_x2, 'ro', markersize=10, label=f'Оптимум: ({optimal_x1:.0f}, {optimal_x2:.0f})')
+        levels = [*levels, result.profit]
+
+    # Линии уровня целевой функции (изопрофиты)
+    for level in levels:
+        if model.profit[1] != 0:
+            x2_profit = (level - model.profit[0]*x1) / model.profit[1]
+            ax.plot(x1, x2_profit, 'k--', alpha=0.5, linewidth=0.8)
+        elif model.profit[0] != 0:
+            ax.axvline(level / model.profit[0], color='k', linestyle='--', alpha=0.5, linewidth=0.8)
+
+    ax.set_xlabel(f'$x_1$ ({model.product_names[0].lower()}, шт.)', fontsize=12)
+    ax.set_ylabel(f'$x_2$ ({model.product_names[1].lower()}, шт.)', fontsize=12)
+    ax.set_title('Задача оптимизации производства: Геометрическое представление', fontsize=14)
+    ax.set_xlim(0, x_max)
+    ax.set_ylim(0, y_max)
+    ax.legend(loc='upper right')
+    ax.grid(True, alpha=0.3)
+    return figure
+
+
+def transport_figure(problem, result, title='Оптимальный план перевозок', figure=None):
+    """Схема перевозок: склады слева, базы справа, стрелки - используемые маршруты."""
+    figure = figure or Figure(figsize=(14, 10))
+    ax = figure.subplots()
+    m, n = problem.n_sources, problem.n_sinks
+
+    # Координаты узлов
+    sources = list(zip([2] * m, np.linspace(8, 3, m) if m > 1 else [5.5]))
+    sinks = list(zip([10] * n, np.linspace(10, 1, n) if n > 1 else [5.5]))
+
+    # Рисуем склады и базы (прямоугольники)
+    nodes = [(sources, problem.source_names, problem.supply, 'Запас', 'lightblue', 'darkblue'),
+             (sinks, problem.sink_names, problem.demand, 'Потребность', 'lightgreen', 'darkgreen')]
+    for positions, names, amounts, caption, face, edge in nodes:
+        for (x, y), name, amount in zip(positions, names, amounts):
+            rect = FancyBboxPatch((x - 1, y - 0.5), 2, 1,
+                                  boxstyle="round,pad=0.1",
+                                  facecolor=face, edgecolor=edge,
+                                  linewidth=2, alpha=0.8)
+            ax.add_patch(rect)
+            ax.text(x, y, f"{name}\n{caption}: {amount:.0f} т",
+                    ha='center', va='center', fontsize=11, fontweight='bold')
+
+    # Рисуем потоки (стрелки); дорогие маршруты - красным
+    expensive = np.median(problem.cost[:m, :n])
+    for i, j in zip(*np.nonzero(result.flow > 0.1)):
+        flow, cost = result.flow[i, j], problem.cost[i, j]
+        start, end = sources[i], sinks[j]
+
+        # Толщина стрелки пропорциональна объёму
+        arrow = FancyArrowPatch(start, end,
+                                arrowstyle='-|>',
+                                color='red' if cost >= expensive else 'orange',
+                                linewidth=0.5 + flow / 50,
+                                alpha=0.7,
+                                mutation_scale=15)
+        ax.add_patch(arrow)
+
+        # Подпись посередине стрелки, со смещением от неё
+        mid_x = (start[0] + end[0]) / 2
+        mid_y = (start[1] + end[1]) / 2
+        ax.text(mid_x + 0.5, mid_y + 0.3,
+                f"{flow:.0f} т\n({cost:g} у.е./т)",
+                fontsize=9,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+
+    ax.set_xlim(0, 12)
+    ax.set_ylim(0, 12)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    figure.tight_layout()
+    return figure
+
+
+def save(figure, target=None, fmt=None):
+    """
+    Сохранить рисунок в файл или буфер.
+    - **target**: путь к файлу, файловый объект или None
+    - **fmt**: 'png' или 'svg'; по умолчанию - по расширению файла, иначе PNG
+    Если target не задан, возвращает содержимое рисунка в виде байтов.
+    """
+    if fmt is None:
+        ext = os.path.splitext(target)[1].lstrip('.').lower() if isinstance(target, str) else ''
+        fmt = ext or 'png'
+    if target is None:
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format=fmt)
+        return buffer.getvalue()
+    figure.savefig(target, format=fmt)
+    return target
+
+
+def render(draw, *args, path=None, figsize=(10, 8), **kwargs):
+    """
+    Построить рисунок функцией `draw` и сохранить его в `path`.
+    Без path рисунок показывается в окне (для этого загружается pyplot).
+    """
+    if path:
+        return save(draw(*args, figure=Figure(figsize=figsize), **kwargs), path)
+
+    import matplotlib.pyplot as plt
+    figure = plt.figure(figsize=figsize)
+    draw(*args, figure=figure, **kwargs)
+    plt.show()
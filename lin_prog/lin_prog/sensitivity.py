@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve, qr
+
+TOL = 1e-9
+
+
+@dataclass
+class SensitivityReport:
+    """
+    Анализ чувствительности оптимального плана.
+    Диапазоны заданы в абсолютных значениях: в их пределах базис
+    (набор используемых продуктов и дефицитных ресурсов) не меняется.
+    """
+    model: object
+    result: object
+    shadow_prices: np.ndarray      # (m,) прирост прибыли на единицу ресурса
+    capacity_lower: np.ndarray     # (m,) допустимый диапазон запаса ресурса
+    capacity_upper: np.ndarray
+    reduced_costs: np.ndarray      # (n,) приведённые оценки продуктов
+    profit_lower: np.ndarray       # (n,) допустимый диапазон цены продукта
+    profit_upper: np.ndarray
+    basic_products: np.ndarray     # индексы продуктов в базисе
+    tight_resources: np.ndarray    # индексы ресурсов, чьи остатки вне базиса
+    basis: np.ndarray = None           # базисные столбцы расширенной матрицы [A | I]
+    basis_inverse: np.ndarray = None   # обратная базисная матрица
+
+    def most_deficient(self):
+        """Индекс ресурса с наибольшей теневой ценой."""
+        return int(np.argmax(self.shadow_prices))
+
+    def capacity_change(self, resource, deltas):
+        """
+        Прибыль при изменении запаса ресурса `resource` на `deltas`.
+        Пока новый запас внутри диапазона устойчивости, ответ берётся
+        из теневой цены; задача перерешивается только для тех изменений,
+        при которых базис меняется.
+        """
+        deltas = np.atleast_1d(np.asarray(deltas, dtype=float))
+        new_capacity = self.model.capacity[resource] + deltas
+        profit = self.result.profit + self.shadow_prices[resource] * deltas
+
+        outside = (new_capacity < self.capacity_lower[resource] - TOL) | \
+                  (new_capacity > self.capacity_upper[resource] + TOL)
+        if outside.any():
+            capacities = np.tile(self.model.capacity, (outside.sum(), 1))
+            capacities[:, resource] = new_capacity[outside]
+            profit[outside] = self.model.solve_batch(capacities=capacities).profit
+        return profit
+
+    def table(self):
+        """Таблица чувствительности ресурсов в виде структурированного массива."""
+        rows = np.zeros(self.model.n_resources, dtype=[
+            ('resource', 'U64'), ('capacity', float), ('slack', float),
+            ('shadow_price', float), ('lower', float), ('upper', float)])
+        rows['resource'] = self.model.resource_names
+        rows['capacity'] = self.model.capacity
+        rows['slack'] = self.result.slack
+        rows['shadow_price'] = self.shadow_prices
+        rows['lower'] = self.capacity_lower
+        rows['upper'] = self.capacity_upper
+        return rows
+
+
+def _basis(usage, x, slack, shadow_prices):
+    """
+    Восстановить оптимальный базис по решению HiGHS.
+    В базис входят продукты с ненулевым выпуском; оставшиеся места
+    заполняются остатками ресурсов. Ресурсы с ненулевой теневой ценой
+    (их остатки обязаны быть вне базиса) выбираются в первую очередь,
+    ресурсы с положительным остатком - в последнюю.
+    """
+    m = usage.shape[0]
+    products = np.flatnonzero(x > TOL)
+    if len(products) == 0:
+        return products, np.array([], dtype=int)
+
+    weight = np.ones(m)
+    weight[shadow_prices > TOL] = 1e6
+    weight[slack > TOL] = 0
+    # QR с выбором ведущих столбцов даёт набор строк, на котором
+    # подматрица базисных продуктов невырождена
+    _, _, pivots = qr(usage[:, products].T * weight, pivoting=True, mode='economic')
+    return products, np.sort(pivots[:len(products)])
+
+
+def analyze(model, result=None):
+    """
+    Вычислить теневые цены и диапазоны устойчивости для всех ресурсов
+    и всех цен продуктов за один проход по обратной базисной матрице.
+    """
+    if result is None:
+        result = model.solve()
+    if not result.success:
+        raise ValueError(f"Анализ чувствительности невозможен: {result.message}")
+
+    A = model.dense_usage()
+    m, n = A.shape
+    y = result.shadow_prices
+    r = result.reduced_costs
+
+    products, tight = _basis(A, result.x, result.slack, y)
+    slack_rows = np.setdiff1d(np.arange(m), tight)
+
+    # Расширенная матрица [A | I]: столбцы 0..n-1 - продукты, n..n+m-1 - остатки
+    basic = np.concatenate([products, n + slack_rows])
+    nonbasic = np.setdiff1d(np.arange(n + m), basic)
+    extended = np.hstack([A, np.eye(m)])
+
+    lu = lu_factor(extended[:, basic])
+    B_inv = lu_solve(lu, np.eye(m))
+    x_B = np.concatenate([result.x[products], result.slack[slack_rows]])
+
+    # Диапазоны правых частей: x_B + delta * B_inv[:, i] >= 0 для каждого i
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = -x_B[:, None] / B_inv
+    up = np.where(B_inv < -TOL, ratios, np.inf).min(axis=0)
+    down = np.where(B_inv > TOL, ratios, -np.inf).max(axis=0)
+    capacity_lower = model.capacity + down
+    capacity_upper = model.capacity + up
+
+    # Диапазоны цен: для базисного продукта k приведённые оценки
+    # небазисных столбцов r_N - delta * alpha[k] должны остаться <= 0
+    r_ext = np.concatenate([r, -y])
+    alpha = B_inv @ extended[:, nonbasic]
+    r_N = r_ext[nonbasic]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = r_N[None, :] / alpha
+    inc = np.where(alpha < -TOL, ratios, np.inf).min(axis=1, initial=np.inf)
+    dec = np.where(alpha > TOL, ratios, -np.inf).max(axis=1, initial=-np.inf)
+
+    profit_lower = model.profit.copy()
+    profit_upper = model.profit.copy()
+    is_product = basic < n
+    profit_lower[basic[is_product]] += dec[is_product]
+    profit_upper[basic[is_product]] += inc[is_product]
+    # Небазисный продукт: цену можно снижать сколько угодно,
+    # а повышать - пока приведённая оценка не станет положительной
+    idle = np.setdiff1d(np.arange(n), products)
+    profit_lower[idle] = -np.inf
+    profit_upper[idle] = model.profit[idle] - r[idle]
+
+    return SensitivityReport(model, result, y, capacity_lower, capacity_upper,
+                             r, profit_lower, profit_upper, products, tight,
+                             basis=basic, basis_inverse=B_inv)
@@ -0,0 +1,220 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sensitivity import TOL, analyze
+from transport import TransportationProblem, tree_edge_flows
+
+# Сколько сценариев обрабатывается и отдаётся за один шаг
+SWEEP_CHUNK = 1000
+
+
+def grid(base, deltas):
+    """
+    Декартова сетка изменений базового вектора.
+    - **base**: базовые значения, форма (d,)
+    - **deltas**: словарь {индекс: массив приращений}
+    Возвращает массив сценариев формы (k, d).
+    """
+    base = np.asarray(base, dtype=float)
+    index = list(deltas)
+    combos = np.array(list(itertools.product(*(deltas[i] for i in index))), dtype=float)
+    scenarios = np.tile(base, (len(combos), 1))
+    scenarios[:, index] += combos
+    return scenarios
+
+
+def production_sweep(model, capacities=None, profits=None, chunk=SWEEP_CHUNK, workers=None):
+    """
+    Перебор вариантов задачи производства с повторным использованием базиса.
+    - **capacities**: запасы ресурсов по сценариям, форма (k, m)
+    - **profits**: цены продуктов по сценариям, форма (k, n)
+    Для каждого сценария сначала проверяется, остаётся ли оптимальным базис
+    базовой задачи (допустимость x_B = B^-1 b и неположительность оценок);
+    такие сценарии решаются одним умножением на B^-1 для всей пачки.
+    Остальные решаются пакетно через ProductionModel.solve_batch.
+    Результаты отдаются по пачкам в виде структурированных массивов;
+    при workers > 1 пачки обрабатываются в пуле процессов.
+    """
+    capacities = np.atleast_2d(model.capacity if capacities is None else np.asarray(capacities, dtype=float))
+    profits = np.atleast_2d(model.profit if profits is None else np.asarray(profits, dtype=float))
+    k = max(len(capacities), len(profits))
+    capacities = np.broadcast_to(capacities, (k, model.n_resources))
+    profits = np.broadcast_to(profits, (k, model.n_products))
+
+    base = model.solve()
+    report = analyze(model, base) if base.success else None
+    chunks = [(start, capacities[start:start + chunk], profits[start:start + chunk])
+              for start in range(0, k, chunk)]
+    yield from _run(_production_chunk, (model, report), chunks, workers)
+
+
+def transport_sweep(problem, costs=None, supplies=None, demands=None,
+                    chunk=SWEEP_CHUNK, workers=None):
+    """
+    Перебор вариантов транспортной задачи с тёплым стартом.
+    - **costs**: стоимости маршрутов по сценариям, форма (k, m, n)
+    - **supplies**, **demands**: запасы (k, m) и потребности (k, n)
+    Запасы и потребности задаются без фиктивных узлов. Перевозки на базисе
+    базового решения пересчитываются сразу для всей пачки; если они
+    неотрицательны, метод потенциалов стартует с этого базиса и при
+    неизменных стоимостях сразу подтверждает оптимальность.
+    """
+    m, n = problem.n_sources, problem.n_sinks
+    base_supply = problem.supply[:m]
+    base_demand = problem.demand[:n]
+    costs = np.asarray(problem.cost[:m, :n] if costs is None else costs, dtype=float)
+    costs = costs.reshape(-1, m, n)
+    supplies = np.atleast_2d(base_supply if supplies is None else np.asarray(supplies, dtype=float))
+    demands = np.atleast_2d(base_demand if demands is None else np.asarray(demands, dtype=float))
+    k = max(len(costs), len(supplies), len(demands))
+    supplies = np.broadcast_to(supplies, (k, m))
+    demands = np.broadcast_to(demands, (k, n))
+    if len(costs) not in (1, k):
+        raise ValueError(f"costs должен содержать 1 или {k} сценариев, получено {len(costs)}")
+
+    base = problem.solve('network')
+    # Общая для всех сценариев матрица стоимостей передаётся в пачку один раз,
+    # а не размножается до (k, m, n)
+    chunks = [(start, costs if len(costs) == 1 else costs[start:start + chunk],
+               supplies[start:start + chunk], demands[start:start + chunk])
+              for start in range(0, k, chunk)]
+    yield from _run(_transport_chunk, (problem, base), chunks, workers)
+
+
+def collect(chunks):
+    """Собрать все пачки результатов в один структурированный массив."""
+    return np.concatenate(list(chunks))
+
+
+def to_parquet(chunks, path):
+    """
+    Записать пачки результатов в Parquet-файл по мере их поступления.
+    Вложенные поля (например, план x) раскладываются по столбцам x_0, x_1, ...
+    Требует установленного pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Для записи в Parquet установите pyarrow") from exc
+
+    writer = None
+    try:
+        for records in chunks:
+            columns = {}
+            for name in records.dtype.names:
+                values = records[name]
+                if values.ndim == 1:
+                    columns[name] = values
+                else:
+                    for j in range(values.shape[1]):
+                        columns[f"{name}_{j}"] = values[:, j]
+            table = pa.table(columns)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _run(func, context, chunks, workers):
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(func, itertools.repeat(context), chunks)
+    else:
+        for item in chunks:
+            yield func(context, item)
+
+
+def _production_chunk(context, item):
+    model, report = context
+    start, capacities, profits = item
+    size = len(capacities)
+    n, m = model.n_products, model.n_resources
+
+    records = np.zeros(size, dtype=[('scenario', int), ('x', float, (n,)), ('profit', float),
+                                    ('status', int), ('warm', bool)])
+    records['scenario'] = np.arange(start, start + size)
+    warm = np.zeros(size, dtype=bool)
+
+    if report is not None:
+        basis, B_inv = report.basis, report.basis_inverse
+        extended = np.hstack([model.dense_usage(), np.eye(m)])
+        nonbasic = np.setdiff1d(np.arange(n + m), basis)
+        c_ext = np.hstack([profits, np.zeros((size, m))])
+
+        # Прямая допустимость: x_B = B^-1 b для всех сценариев пачки
+        x_B = capacities @ B_inv.T
+        # Двойственная допустимость: оценки небазисных столбцов c_N - y N <= 0
+        y = c_ext[:, basis] @ B_inv
+        reduced = c_ext[:, nonbasic] - y @ extended[:, nonbasic]
+        warm = (x_B >= -TOL).all(axis=1) & (reduced <= TOL).all(axis=1)
+
+        is_product = basis < n
+        x = np.zeros((size, n))
+        x[:, basis[is_product]] = x_B[:, is_product]
+        records['x'][warm] = x[warm]
+        records['profit'][warm] = np.einsum('kn,kn->k', profits[warm], x[warm])
+
+    cold = ~warm
+    if cold.any():
+        batch = model.solve_batch(profits=profits[cold], capacities=capacities[cold])
+        records['x'][cold] = batch.x
+        records['profit'][cold] = batch.profit
+        records['status'][cold] = batch.status
+    records['warm'] = warm
+    return records
+
+
+def _transport_chunk(context, item):
+    problem, base = context
+    start, costs, supplies, demands = item
+    size = len(supplies)
+    m, n = problem.n_sources, problem.n_sinks
+
+    records = np.zeros(size, dtype=[('scenario', int), ('cost', float),
+                                    ('status', int), ('warm', bool)])
+    records['scenario'] = np.arange(start, start + size)
+
+    # costs - одна матрица на все сценарии пачки или по матрице на сценарий
+    def cost_of(s):
+        return costs[0] if len(costs) == 1 else costs[s]
+
+    # Базис подходит только сценариям с той же балансировкой, что и у базовой задачи
+    gap = demands.sum(axis=1) - supplies.sum(axis=1)
+    same = ((gap > TOL) == problem.dummy_source) & ((gap < -TOL) == problem.dummy_sink)
+    feasible = np.zeros(size, dtype=bool)
+    direct = np.zeros(size, dtype=bool)
+    solution = None
+    if base.success and same.any():
+        balanced_supply = np.hstack([supplies, gap[:, None]]) if problem.dummy_source else supplies
+        balanced_demand = np.hstack([demands, -gap[:, None]]) if problem.dummy_sink else demands
+        # Перевозки считаются только по рёбрам базисного дерева: (k, m + n - 1), а не (k, m, n)
+        solution = tree_edge_flows(problem.basis_tree(base), balanced_supply[same],
+                                   balanced_demand[same], problem.shape)
+    if solution is not None:
+        edges, flows = solution
+        feasible[same] = flows.min(axis=1, initial=0.0) >= -TOL
+
+        # Стоимости не менялись и базис допустим - план оптимален без итераций
+        base_cost = problem.cost[:m, :n]
+        if len(costs) == 1:
+            unchanged = np.full(size, np.array_equal(costs[0], base_cost))
+        else:
+            unchanged = np.array([np.array_equal(costs[s], base_cost) for s in range(size)])
+        direct = feasible & unchanged
+        edge_cost = problem.cost[edges[:, 0], edges[:, 1]]
+        records['cost'][direct] = flows[direct[same]] @ edge_cost
+
+    for s in np.flatnonzero(~direct):
+        scenario = TransportationProblem(cost_of(s), supplies[s], demands[s],
+                                         shortage_cost=problem.shortage_cost,
+                                         surplus_cost=problem.surplus_cost)
+        result = scenario.solve('network', warm_start=base if feasible[s] else None)
+        records['cost'][s] = result.cost
+        records['status'][s] = result.status
+    records['warm'] = feasible
+    return records
@@ -0,0 +1,504 @@
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+TOL = 1e-9
+
+# Сколько клеток просматривается за один шаг выбора входящей клетки
+PRICING_BLOCK = 50_000
+
+
+@dataclass
+class TransportationResult:
+    """Оптимальный план перевозок."""
+    flow: np.ndarray       # (m, n) объёмы перевозок по реальным маршрутам
+    cost: float            # значение целевой функции (со штрафами фиктивных маршрутов)
+    shortage: np.ndarray   # (n,) недопоставка каждой базе (поставки фиктивного склада)
+    surplus: np.ndarray    # (m,) остаток на каждом складе (отправки на фиктивную базу)
+    status: int            # код статуса (0 - оптимум найден)
+    message: str
+    u: np.ndarray = None               # (m,) потенциалы складов
+    v: np.ndarray = None               # (n,) потенциалы баз
+    reduced_costs: np.ndarray = None   # (m, n) оценки маршрутов c_ij - u_i - v_j
+    basis: np.ndarray = None           # (k, 2) базисные клетки сбалансированной задачи
+
+    @property
+    def success(self):
+        return self.status == 0
+
+
+class TransportationProblem:
+    """
+    Транспортная задача:
+        sum(cost * x) -> min,  x.sum(axis=1) = supply,  x.sum(axis=0) = demand,  x >= 0.
+    - **cost**: стоимость перевозки единицы груза, форма (m, n)
+    - **supply**: запасы складов, форма (m,)
+    - **demand**: потребности баз, форма (n,)
+    - **shortage_cost**: штраф за единицу недопоставки (если запасов не хватает)
+    - **surplus_cost**: стоимость хранения единицы невывезенного запаса
+    Несбалансированная задача автоматически дополняется фиктивным складом
+    или фиктивной базой.
+    """
+
+    def __init__(self, cost, supply, demand, source_names=None, sink_names=None,
+                 shortage_cost=0.0, surplus_cost=0.0):
+        cost = np.atleast_2d(np.asarray(cost, dtype=float))
+        supply = np.asarray(supply, dtype=float)
+        demand = np.asarray(demand, dtype=float)
+
+        m, n = cost.shape
+        if supply.shape != (m,):
+            raise ValueError(f"supply должен иметь форму ({m},), получено {supply.shape}")
+        if demand.shape != (n,):
+            raise ValueError(f"demand должен иметь форму ({n},), получено {demand.shape}")
+
+        self.n_sources, self.n_sinks = m, n
+        self.source_names = list(source_names) if source_names else [f"Склад {i + 1}" for i in range(m)]
+        self.sink_names = list(sink_names) if sink_names else [f"База {j + 1}" for j in range(n)]
+
+        # Балансировка: недостающий объём отдаёт фиктивный склад,
+        # лишний объём забирает фиктивная база
+        gap = demand.sum() - supply.sum()
+        self.dummy_source = gap > TOL
+        self.dummy_sink = gap < -TOL
+        if self.dummy_source:
+            cost = np.vstack([cost, np.full(n, shortage_cost)])
+            supply = np.append(supply, gap)
+        elif self.dummy_sink:
+            cost = np.hstack([cost, np.full((m, 1), surplus_cost)])
+            demand = np.append(demand, -gap)
+
+        self.cost = cost
+        self.supply = supply
+        self.demand = demand
+        self.shortage_cost = shortage_cost
+        self.surplus_cost = surplus_cost
+
+    @property
+    def shape(self):
+        """Размер сбалансированной задачи (с фиктивными узлами)."""
+        return self.cost.shape
+
+    def constraint_matrix(self):
+        """
+        Матрица ограничений-равенств в формате CSR, форма (m + n, m * n).
+        Переменная x_ij имеет номер i * n + j и входит ровно в две строки:
+        строку склада i и строку базы m + j.
+        """
+        m, n = self.shape
+        columns = np.arange(m * n)
+        rows = np.concatenate([columns // n, m + columns % n])
+        data = np.ones(2 * m * n)
+        return sparse.csr_matrix((data, (rows, np.concatenate([columns, columns]))),
+                                 shape=(m + n, m * n))
+
+    def solve(self, method='highs', warm_start=None):
+        """
+        Решить задачу.
+        - **method**: 'highs' - HiGHS на разреженной матрице ограничений
+          ('highs-ds' / 'highs-ipm' - симплекс или метод внутренней точки HiGHS),
+          'network' - транспортный симплекс-метод (метод потенциалов)
+        - **warm_start**: результат решения задачи той же формы; метод
+          потенциалов продолжит итерации с его базиса, если тот допустим
+        """
+        if method in ('highs', 'highs-ds', 'highs-ipm'):
+            flow, u, v, status, message = self._solve_highs(method)
+            if flow is not None:
+                flow, u, v = self._basic_solution(flow, u, v)
+            solution = flow, u, v, status, message
+        elif method == 'network':
+            start = self.basis_flow(warm_start) if warm_start is not None else None
+            solution = self._solve_network(start=start)
+        else:
+            raise ValueError(f"Неизвестный метод: {method}")
+        return self._result(*solution)
+
+    def route_cost_range(self, result, i, j):
+        """
+        Диапазон стоимости маршрута (i, j), в котором оптимальный план
+        не меняется. Для неиспользуемого маршрута нижняя граница равна
+        c_ij - d_ij (d_ij - оценка маршрута). Для базисного маршрута удаление
+        его из дерева делит узлы на две части, и изменение стоимости на delta
+        сдвигает на ±delta оценки всех маршрутов между частями.
+        """
+        c = self.cost[i, j]
+        m = self.shape[0]
+        if not ((result.basis[:, 0] == i) & (result.basis[:, 1] == j)).any():
+            return c - result.reduced_costs[i, j], np.inf
+
+        tree = self.basis_tree(result)
+        u, v, _, _ = _potentials(self.cost, tree, m)
+        reduced = self.cost - u[:, None] - v[None, :]
+        reduced[i, j] = np.inf
+
+        tree[i].discard(m + j)
+        tree[m + j].discard(i)
+        side = np.zeros(sum(self.shape), dtype=bool)
+        side[list(_component(tree, i))] = True
+        rows, cols = side[:m], side[m:]
+        # Часть со складом i: потенциалы её складов растут на delta, баз - падают
+        up = reduced[rows[:, None] & ~cols[None, :]].min(initial=np.inf)
+        down = reduced[~rows[:, None] & cols[None, :]].min(initial=np.inf)
+        return c - down, c + up
+
+    def route_cost_change(self, result, i, j, new_cost, method='highs'):
+        """
+        Минимальная стоимость перевозок, если стоимость маршрута (i, j)
+        станет равна `new_cost`. Внутри диапазона устойчивости ответ
+        находится без решения задачи; иначе задача перерешивается.
+        """
+        low, high = self.route_cost_range(result, i, j)
+        if low <= new_cost <= high:
+            return result.cost + result.flow[i, j] * (new_cost - self.cost[i, j])
+        cost = self.cost.copy()
+        cost[i, j] = new_cost
+        changed = TransportationProblem(cost, self.supply, self.demand)
+        return changed.solve(method).cost
+
+    def _result(self, flow, u, v, status, message):
+        m, n = self.n_sources, self.n_sinks
+        if flow is None:
+            return TransportationResult(np.full((m, n), np.nan), np.nan, np.full(n, np.nan),
+                                        np.full(m, np.nan), status, message)
+        shortage = flow[m] if self.dummy_source else np.zeros(n)
+        surplus = flow[:m, n] if self.dummy_sink else np.zeros(m)
+
+        # Потенциалы определены с точностью до сдвига u + k, v - k; фиксируем u_0 = 0
+        u, v = u - u[0], v + u[0]
+        reduced = self.cost - u[:, None] - v[None, :]
+        tree = _basis_tree(flow, reduced)
+        basis = np.array([(a, b - self.shape[0]) for a in range(self.shape[0]) for b in tree[a]])
+        return TransportationResult(flow[:m, :n], float((self.cost * flow).sum()),
+                                    shortage, surplus, status, message,
+                                    u=u[:m], v=v[:n], reduced_costs=reduced[:m, :n], basis=basis)
+
+    def _solve_highs(self, method='highs', A_eq=None):
+        m, n = self.shape
+        res = linprog(self.cost.ravel(), A_eq=self.constraint_matrix() if A_eq is None else A_eq,
+                      b_eq=np.concatenate([self.supply, self.demand]),
+                      bounds=(0, None), method=method)
+        if res.x is None:
+            return None, None, None, res.status, res.message
+        # Множители ограничений-равенств - это и есть потенциалы u_i, v_j
+        duals = res.eqlin.marginals
+        return res.x.reshape(m, n), duals[:m], duals[m:], res.status, res.message
+
+    def _basic_solution(self, flow, u, v):
+        """
+        Согласовать решение HiGHS с базисом. При вырожденном плане
+        двойственные оценки HiGHS могут не обнуляться ни на одном остовном
+        дереве, содержащем перевозки; тогда базис доводится методом
+        потенциалов, начиная с дерева плана HiGHS (итерации вырожденные,
+        план и стоимость не меняются).
+        """
+        m = self.shape[0]
+        tree = _basis_tree(flow, self.cost - u[:, None] - v[None, :])
+        tol = TOL * max(1.0, np.abs(self.cost).max())
+        if all(abs(self.cost[a, b - m] - u[a] - v[b - m]) <= tol for a in range(m) for b in tree[a]):
+            return flow, u, v
+        start = tree_flows(tree, self.supply[None, :], self.demand[None, :], self.shape)
+        if start is None or start.min() < -TOL:
+            return flow, u, v
+        network_flow, u_net, v_net, status, _ = self._solve_network(start=(np.maximum(start[0], 0.0), tree))
+        if status != 0:
+            return flow, u, v
+        return network_flow, u_net, v_net
+
+    def basis_tree(self, result):
+        """Остовное дерево базиса результата в виде списков смежности."""
+        m = self.shape[0]
+        tree = [set() for _ in range(sum(self.shape))]
+        for a, b in result.basis:
+            tree[a].add(m + b)
+            tree[m + b].add(a)
+        return tree
+
+    def basis_flow(self, result):
+        """
+        Перевозки на базисе `result` для запасов и потребностей этой задачи.
+        Возвращает (flow, tree) или None, если базис не подходит
+        (другая форма задачи или отрицательные перевозки).
+        """
+        if result.basis is None or len(result.basis) != sum(self.shape) - 1:
+            return None
+        tree = self.basis_tree(result)
+        flow = tree_flows(tree, self.supply[None, :], self.demand[None, :], self.shape)
+        if flow is None or flow.min() < -TOL:
+            return None
+        return np.maximum(flow[0], 0.0), tree
+
+    def _solve_network(self, max_iter=None, start=None):
+        cost, supply, demand = self.cost, self.supply, self.demand
+        m, n = cost.shape
+        if supply.min(initial=0) < 0 or demand.min(initial=0) < 0:
+            return None, None, None, 2, "Отрицательные запасы или потребности"
+
+        flow, tree = start if start is not None else _initial_tree(cost, supply, demand)
+        u, v, parent, depth = _potentials(cost, tree, m)
+        max_iter = max_iter or 50 * (m + n) + 1000
+        tol = TOL * max(1.0, np.abs(cost).max())
+
+        # Частичный выбор входящей клетки: оценки считаются по блоку строк,
+        # к следующему блоку переходим, только если в текущем нет улучшения
+        block = max(1, PRICING_BLOCK // n)
+        n_blocks = -(-m // block)
+        current, idle = 0, 0
+
+        for _ in range(max_iter):
+            start = current * block
+            reduced = cost[start:start + block] - u[start:start + block, None] - v[None, :]
+            k = int(np.argmin(reduced))
+            if reduced.flat[k] >= -tol:
+                idle += 1
+                if idle >= n_blocks:
+                    return flow, u, v, 0, "Оптимальный план найден (метод потенциалов)"
+                current = (current + 1) % n_blocks
+                continue
+            idle = 0
+
+            i, j = divmod(k, n)
+            i += start
+            cycle = _cycle(i, m + j, parent, depth, m)
+            # Клетки цикла чередуются: чётные позиции уменьшаются, нечётные увеличиваются
+            minus = cycle[0::2]
+            theta, out = min((flow[r, c], pos) for pos, (r, c) in enumerate(minus))
+            for r, c in minus:
+                flow[r, c] -= theta
+            for r, c in cycle[1::2]:
+                flow[r, c] += theta
+            flow[i, j] += theta
+
+            r, c = minus[out]
+            flow[r, c] = 0.0
+            _pivot(tree, u, v, parent, depth, (r, m + c), (i, m + j), reduced.flat[k], m)
+
+        return flow, u, v, 1, "Достигнут предел числа итераций"
+
+
+def tree_flows(tree, supply, demand, shape):
+    """
+    Перевозки на остовном дереве для k вариантов запасов и потребностей
+    сразу: supply (k, m), demand (k, n) -> flow (k, m, n).
+    Возвращает None, если дерево не связно.
+    """
+    solution = tree_edge_flows(tree, supply, demand, shape)
+    if solution is None:
+        return None
+    edges, edge_flow = solution
+    flow = np.zeros((len(edge_flow),) + tuple(shape))
+    flow[:, edges[:, 0], edges[:, 1]] = edge_flow
+    return flow
+
+
+def tree_edge_flows(tree, supply, demand, shape):
+    """
+    Перевозки только по рёбрам остовного дерева: supply (k, m), demand (k, n) ->
+    (edges, flow), где edges (m + n - 1, 2) - клетки (склад, база),
+    flow (k, m + n - 1) - перевозки по ним. Поддерево каждого узла должно
+    отправить по ребру к родителю весь свой избыток, поэтому перевозки
+    получаются одним проходом от листьев к корню.
+    Возвращает None, если дерево не связно.
+    """
+    m, n = shape
+    _, _, parent, _ = _potentials(np.zeros(shape), tree, m)
+    order = _bfs_order(tree, parent)
+    if len(order) != m + n:
+        return None
+
+    excess = np.hstack([supply, -demand]).astype(float)
+    edges = np.zeros((m + n - 1, 2), dtype=int)
+    flow = np.zeros((len(excess), m + n - 1))
+    for e, x in enumerate(reversed(order[1:])):
+        p = parent[x]
+        if x < m:
+            edges[e] = x, p - m
+            flow[:, e] = excess[:, x]
+        else:
+            edges[e] = p, x - m
+            flow[:, e] = -excess[:, x]
+        excess[:, p] += excess[:, x]
+    return edges, flow
+
+
+def _bfs_order(tree, parent):
+    order = [0]
+    for x in order:
+        order.extend(y for y in tree[x] if y != parent[x])
+    return order
+
+
+def _initial_tree(cost, supply, demand):
+    """
+    Начальный опорный план методом минимального элемента.
+    Возвращает план и остовное дерево базисных клеток в виде списков
+    смежности: узлы 0..m-1 - склады, m..m+n-1 - базы.
+    """
+    m, n = cost.shape
+    flow = np.zeros((m, n))
+    left_s, left_d = supply.copy(), demand.copy()
+    tree = [set() for _ in range(m + n)]
+    order = np.argsort(cost, axis=None, kind='stable')
+    rows, cols = np.unravel_index(order, cost.shape)
+    rows, cols = rows.tolist(), cols.tolist()
+
+    remaining = left_s.sum()
+    for i, j in zip(rows, cols):
+        if remaining <= TOL:
+            break
+        if left_s[i] <= TOL or left_d[j] <= TOL:
+            continue
+        q = min(left_s[i], left_d[j])
+        flow[i, j] = q
+        left_s[i] -= q
+        left_d[j] -= q
+        remaining -= q
+        tree[i].add(m + j)
+        tree[m + j].add(i)
+
+    # Вырожденный план: достраиваем дерево нулевыми перевозками
+    # по самым дешёвым клеткам, соединяющим разные компоненты
+    _connect(tree, rows, cols, m)
+    return flow, tree
+
+
+def _connect(tree, rows, cols, m):
+    """
+    Дополнить лес `tree` до остовного дерева клетками (rows[k], cols[k])
+    в заданном порядке, пропуская клетки, которые замкнули бы цикл.
+    """
+    size = len(tree)
+    parent = list(range(size))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    edges = 0
+    for a in range(m):
+        for b in tree[a]:
+            parent[find(a)] = find(b)
+            edges += 1
+
+    for i, j in zip(rows, cols):
+        if edges >= size - 1:
+            break
+        a, b = find(i), find(m + j)
+        if a == b:
+            continue
+        parent[a] = b
+        tree[i].add(m + j)
+        tree[m + j].add(i)
+        edges += 1
+
+
+def _basis_tree(flow, reduced):
+    """
+    Остовное дерево базиса по оптимальному плану: сначала клетки
+    с ненулевой перевозкой, затем клетки с наименьшей по модулю оценкой.
+    """
+    m, n = flow.shape
+    priority = np.where(flow > TOL, -1.0, np.abs(reduced))
+    order = np.argsort(priority, axis=None, kind='stable')
+    rows, cols = np.unravel_index(order, flow.shape)
+    tree = [set() for _ in range(m + n)]
+    _connect(tree, rows.tolist(), cols.tolist(), m)
+    return tree
+
+
+def _potentials(cost, tree, m):
+    """
+    Потенциалы u (склады) и v (базы) из условия u_i + v_j = c_ij
+    на базисных клетках; обход дерева в ширину от склада 0.
+    """
+    n = cost.shape[1]
+    pot = [0.0] * (m + n)
+    parent = [-1] * (m + n)
+    depth = [0] * (m + n)
+    queue = deque([0])
+    while queue:
+        a = queue.popleft()
+        for b in tree[a]:
+            if b == parent[a]:
+                continue
+            parent[b] = a
+            depth[b] = depth[a] + 1
+            i, j = (a, b - m) if a < m else (b, a - m)
+            pot[b] = cost[i, j] - pot[a]
+            queue.append(b)
+    pot = np.array(pot)
+    return pot[:m], pot[m:], parent, depth
+
+
+def _pivot(tree, u, v, parent, depth, leaving, entering, delta, m):
+    """
+    Заменить в дереве клетку `leaving` на `entering` и обновить потенциалы.
+    Удаление клетки отрезает от дерева поддерево S; меняются потенциалы и
+    глубины только его узлов: S перевешивается на входящую клетку, а
+    потенциалы в нём сдвигаются на оценку входящей клетки `delta`.
+    """
+    a, b = leaving
+    tree[a].discard(b)
+    tree[b].discard(a)
+    child = a if parent[a] == b else b
+    subtree = _component(tree, child)
+
+    i, q = entering
+    inner, outer = (i, q) if i in subtree else (q, i)
+    tree[i].add(q)
+    tree[q].add(i)
+
+    nodes = np.fromiter(subtree, dtype=int, count=len(subtree))
+    rows, cols = nodes[nodes < m], nodes[nodes >= m] - m
+    sign = 1.0 if inner < m else -1.0
+    u[rows] += sign * delta
+    v[cols] -= sign * delta
+
+    parent[inner] = outer
+    depth[inner] = depth[outer] + 1
+    queue = deque([inner])
+    while queue:
+        x = queue.popleft()
+        for y in tree[x]:
+            if y != parent[x]:
+                parent[y] = x
+                depth[y] = depth[x] + 1
+                queue.append(y)
+
+
+def _component(tree, start):
+    """Множество узлов, достижимых из `start` по рёбрам дерева."""
+    seen = {start}
+    stack = [start]
+    while stack:
+        x = stack.pop()
+        for y in tree[x]:
+            if y not in seen:
+                seen.add(y)
+                stack.append(y)
+    return seen
+
+
+def _cycle(row, col_node, parent, depth, m):
+    """
+    Клетки цикла, который замыкает входящая клетка (row, col_node - m):
+    путь по дереву от базы к складу через их общего предка.
+    """
+    left, right = [col_node], [row]
+    a, b = col_node, row
+    while depth[a] > depth[b]:
+        a = parent[a]
+        left.append(a)
+    while depth[b] > depth[a]:
+        b = parent[b]
+        right.append(b)
+    while a != b:
+        a, b = parent[a], parent[b]
+        left.append(a)
+        right.append(b)
+    path = left + right[-2::-1]
+    return [(a, b - m) if a < m else (b, a - m) for a, b in zip(path, path[1:])]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Модули пакета импортируют друг друга без префикса (from model import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lin_prog"))
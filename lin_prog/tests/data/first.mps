@@ -0,0 +1,23 @@
+* Задача из first.py с дополнительной границей для проверки секции BOUNDS
+NAME          FIRST
+OBJSENSE
+    MAX
+ROWS
+ N  PROFIT
+ L  CPU
+ L  RAM
+ L  BATTERY
+ G  MINPHONE
+COLUMNS
+    PHONE     PROFIT       8000.0   CPU             2.0
+    PHONE     RAM             4.0   BATTERY         1.0
+    PHONE     MINPHONE        1.0
+    TABLET    PROFIT      12000.0   CPU             3.0
+    TABLET    RAM             6.0   BATTERY         2.0
+RHS
+    RHS       CPU           240.0   RAM           480.0
+    RHS       BATTERY       150.0   MINPHONE       10.0
+BOUNDS
+ UP BND       TABLET         70.0
+ PL BND       PHONE
+ENDATA
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from model import ProductionModel
+
+
+def test_round_down_uses_overrides():
+    model = ProductionModel([8000, 12000], [[2, 3], [4, 6], [1, 2]], [240, 480, 150])
+    profit, capacity = np.array([5.0, 9.0]), np.array([101.0, 199.0, 75.5])
+    result = model.solve(profit=profit, capacity=capacity)
+    rounded = model.round_down(result, profit=profit, capacity=capacity)
+
+    assert np.array_equal(rounded.x, np.floor(result.x + 1e-9))
+    assert rounded.profit == pytest.approx(profit @ rounded.x)
+    np.testing.assert_allclose(rounded.slack, capacity - model.usage @ rounded.x)
+    assert (rounded.slack >= 0).all()
+
+
+def assert_batch_matches_solve(model, batch, profits, capacities):
+    for s in range(len(batch)):
+        expected = model.solve(profit=profits[s], capacity=capacities[s])
+        assert batch.status[s] == expected.status
+        if expected.success:
+            # Оптимальный план может быть не единственным: сравниваем прибыль и допустимость
+            assert batch.profit[s] == pytest.approx(expected.profit, rel=1e-7)
+            assert profits[s] @ batch.x[s] == pytest.approx(expected.profit, rel=1e-7)
+            assert (model.usage @ batch.x[s] <= capacities[s] + 1e-6).all()
+            assert (batch.x[s] >= -1e-9).all()
+        else:
+            assert np.isnan(batch.x[s]).all() == np.isnan(expected.x).all()
+
+
+@pytest.mark.parametrize("chunk", [1, 4, 7, 100])
+def test_solve_batch_matches_solve_across_chunks(chunk):
+    rng = np.random.default_rng(0)
+    model = ProductionModel(rng.uniform(1, 10, 4), rng.uniform(0.5, 5, (3, 4)), rng.uniform(50, 100, 3))
+    profits = model.profit * rng.uniform(0.5, 1.5, (23, 4))
+    capacities = model.capacity * rng.uniform(0.5, 1.5, (23, 3))
+    batch = model.solve_batch(profits=profits, capacities=capacities, chunk=chunk)
+
+    assert len(batch) == 23
+    assert batch.success.all()
+    assert_batch_matches_solve(model, batch, profits, capacities)
+
+
+def test_solve_batch_falls_back_per_scenario():
+    # Второй продукт освобождает первый ресурс и не тратит второй:
+    # при положительной цене x_2 неограничен, а при x_1 <= -1 задача несовместна
+    model = ProductionModel([1, -1], [[1, -1], [1, 0]], [5, 5])
+    profits = np.array([[1, -1], [1, -1], [1, 1], [1, -1], [2, -1], [1, -1], [1, -1]], dtype=float)
+    capacities = np.array([[5, 5], [5, -1], [5, 5], [3, 4], [5, 5], [5, 5], [6, 2]], dtype=float)
+    batch = model.solve_batch(profits=profits, capacities=capacities, chunk=3)
+
+    assert batch.status.tolist() == [0, 2, 3, 0, 0, 0, 0]
+    assert_batch_matches_solve(model, batch, profits, capacities)
+
+
+def test_solve_batch_broadcasts_profit():
+    model = ProductionModel([8000, 12000], [[2, 3], [4, 6], [1, 2]], [240, 480, 150])
+    capacities = model.capacity + np.arange(-30, 31, 10)[:, None]
+    batch = model.solve_batch(profits=model.profit, capacities=capacities, chunk=3)
+
+    assert len(batch) == len(capacities)
+    profits = np.broadcast_to(model.profit, (len(capacities), 2))
+    assert_batch_matches_solve(model, batch, profits, capacities)
@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+from model import ProductionModel
+from model_io import load_model, read_mps, save_model
+from transport import TransportationProblem
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def production_model(sparse_usage):
+    usage = np.array([[2, 3, 0], [4, 6, 1], [1, 2, 0]], dtype=float)
+    return ProductionModel([8000, 12000, 500], sparse.csr_matrix(usage) if sparse_usage else usage,
+                           [240, 480, 150], product_names=["Смартфоны", "Планшеты", "Часы"],
+                           resource_names=["Процессорное время", "Оперативная память", "Аккумуляторы"])
+
+
+@pytest.mark.parametrize("sparse_usage", [False, True])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_production_round_trip(tmp_path, sparse_usage, mmap):
+    model = production_model(sparse_usage)
+    save_model(model, tmp_path / "model")
+    loaded = load_model(tmp_path / "model", mmap=mmap)
+
+    assert sparse.issparse(loaded.usage)
+    np.testing.assert_array_equal(loaded.dense_usage(), model.dense_usage())
+    np.testing.assert_array_equal(loaded.profit, model.profit)
+    np.testing.assert_array_equal(loaded.capacity, model.capacity)
+    assert loaded.product_names == model.product_names
+    assert loaded.resource_names == model.resource_names
+    assert loaded.solve().profit == pytest.approx(model.solve().profit)
+
+
+def is_mapped(array):
+    """Проверить, что массив - представление отображённого в память файла, а не копия."""
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_mmap_load(tmp_path, mmap):
+    save_model(production_model(True), tmp_path / "model")
+    loaded = load_model(tmp_path / "model", mmap=mmap)
+    # Матрица собрана без копирования: данные CSR остаются отображением файла
+    assert is_mapped(loaded.usage.data) == mmap
+    assert is_mapped(loaded.usage.indptr) == mmap
+
+
+def test_transport_round_trip(tmp_path):
+    problem = TransportationProblem([[4, 8, 1], [6, 3, 2]], [100, 80], [60, 70, 90],
+                                    shortage_cost=7, source_names=["А", "Б"])
+    save_model(problem, tmp_path / "transport")
+    loaded = load_model(tmp_path / "transport")
+    np.testing.assert_array_equal(loaded.cost, problem.cost)
+    np.testing.assert_array_equal(loaded.supply, problem.supply)
+    np.testing.assert_array_equal(loaded.demand, problem.demand)
+    assert loaded.dummy_source and loaded.shortage_cost == 7
+    assert loaded.source_names == ["А", "Б"]
+    assert loaded.solve().cost == pytest.approx(problem.solve().cost)
+
+
+def test_version_mismatch(tmp_path):
+    save_model(production_model(False), tmp_path / "model")
+    meta_path = tmp_path / "model" / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["version"] += 1
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    with pytest.raises(ValueError, match="версия"):
+        load_model(tmp_path / "model")
+
+
+def test_save_rejects_unknown_model(tmp_path):
+    with pytest.raises(TypeError):
+        save_model(object(), tmp_path / "model")
+
+
+def test_read_mps():
+    model = read_mps(os.path.join(DATA, "first.mps"))
+    assert model.product_names == ["PHONE", "TABLET"]
+    assert model.resource_names == ["CPU", "RAM", "BATTERY", "MINPHONE", "UP TABLET"]
+    np.testing.assert_array_equal(model.profit, [8000, 12000])
+    np.testing.assert_array_equal(model.dense_usage(),
+                                  [[2, 3], [4, 6], [1, 2], [-1, 0], [0, 1]])
+    np.testing.assert_array_equal(model.capacity, [240, 480, 150, -10, 70])
+    result = model.solve()
+    assert result.profit == pytest.approx(960000)
+    assert result.x[0] >= 10 - 1e-9
+
+
+def write_mps(tmp_path, bounds, sense="MAX"):
+    path = tmp_path / "model.mps"
+    path.write_text(f"""NAME TEST
+OBJSENSE
+    {sense}
+ROWS
+ N  OBJ
+ L  R1
+ E  R2
+COLUMNS
+    X  OBJ  1.0  R1  1.0
+    X  R2   1.0
+    Y  OBJ  2.0  R1  1.0
+RHS
+    RHS  R1  10.0  R2  4.0
+BOUNDS
+{bounds}
+ENDATA
+""", encoding="utf-8")
+    return str(path)
+
+
+def test_read_mps_equality_and_minimize(tmp_path):
+    model = read_mps(write_mps(tmp_path, " LO BND X 0", sense="MIN"))
+    np.testing.assert_array_equal(model.profit, [-1, -2])
+    np.testing.assert_array_equal(model.dense_usage(), [[1, 1], [1, 0], [-1, 0]])
+    np.testing.assert_array_equal(model.capacity, [10, 4, -4])
+
+
+@pytest.mark.parametrize("bounds", [" PL BND X", " FX BND Y 0", " UP X 5", " LO BND Y 0.0"])
+def test_read_mps_supported_bounds(tmp_path, bounds):
+    assert read_mps(write_mps(tmp_path, bounds)).solve().success
+
+
+@pytest.mark.parametrize("bounds", [" FR BND X", " MI BND Y", " BV BND X", " LO BND X 1", " FX BND Y 3"])
+def test_read_mps_unsupported_bounds(tmp_path, bounds):
+    with pytest.raises(ValueError, match="не поддерживается"):
+        read_mps(write_mps(tmp_path, bounds))
+
+
+def test_read_mps_unknown_bound(tmp_path):
+    with pytest.raises(ValueError, match="Неизвестный тип границы"):
+        read_mps(write_mps(tmp_path, " XX BND X 1"))
+    with pytest.raises(ValueError, match="неизвестного столбца"):
+        read_mps(write_mps(tmp_path, " UP BND Z 1"))
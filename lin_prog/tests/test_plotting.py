@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import plotting
+from model import ProductionModel
+
+
+@pytest.mark.parametrize("usage, capacity", [
+    ([[2, 3], [4, 6], [1, 2]], [240, 480, 150]),
+    ([[1, 1], [-1, -1]], [10, -20]),      # несовместные ограничения: пустая область
+    ([[1, 0], [1, 2]], [30, 100]),        # ограничение только на x_1: вертикальная прямая
+])
+def test_production_figure_renders(usage, capacity):
+    model = ProductionModel([8000, 12000], usage, capacity)
+    figure = plotting.production_figure(model, model.solve(), levels=[100000])
+    assert plotting.save(figure, fmt="png").startswith(b"\x89PNG")
+
+
+def test_unbounded_region_is_clipped_to_axes():
+    # x_1 - x_2 <= 10: область уходит в бесконечность вверх и вправо
+    model = ProductionModel([-1, -1], [[1, -1]], [10])
+    figure = plotting.production_figure(model, model.solve())
+    ax = figure.axes[0]
+    (polygon,) = ax.patches
+    x_max, y_max = ax.get_xlim()[1], ax.get_ylim()[1]
+    vertices = polygon.get_xy()
+    assert vertices[:, 0].max() == pytest.approx(x_max)
+    assert vertices[:, 1].max() == pytest.approx(y_max)
+    path = polygon.get_path()
+    assert path.contains_point((x_max / 2, y_max / 2))
+    assert not path.contains_point((x_max * 0.99, y_max * 0.001))
+
+
+def test_bounded_region_is_not_clipped():
+    model = ProductionModel([8000, 12000], [[2, 3], [4, 6], [1, 2]], [240, 480, 150])
+    figure = plotting.production_figure(model, model.solve())
+    (polygon,) = figure.axes[0].patches
+    vertices = {tuple(np.round(v, 6)) for v in polygon.get_xy()}
+    assert vertices == {(0, 0), (120, 0), (30, 60), (0, 75)}
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from model import ProductionModel
+from sensitivity import analyze
+
+
+def first_model():
+    """Задача из first.py: смартфоны и планшеты."""
+    return ProductionModel([8000, 12000], [[2, 3], [4, 6], [1, 2]], [240, 480, 150])
+
+
+def random_models(count, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        n, m = rng.integers(2, 6, size=2)
+        yield ProductionModel(rng.uniform(1, 10, n), rng.uniform(0.5, 5, (m, n)), rng.uniform(50, 100, m))
+
+
+def resolve_profit(model, resource, capacity):
+    capacities = model.capacity.copy()
+    capacities[resource] = capacity
+    return model.solve(capacity=capacities).profit
+
+
+def predicted_profit(report, resource, capacity):
+    return report.result.profit + report.shadow_prices[resource] * (capacity - report.model.capacity[resource])
+
+
+def test_first_shadow_prices_and_ranges():
+    report = analyze(first_model())
+    np.testing.assert_allclose(report.shadow_prices, [4000, 0, 0], atol=1e-6)
+    assert report.capacity_lower[0] == pytest.approx(225)
+    assert report.capacity_upper[0] == pytest.approx(240)
+    assert report.most_deficient() == 0
+
+
+def test_first_cpu_range_matches_resolves():
+    model = first_model()
+    report = analyze(model)
+    for capacity in (225, 230, 240):
+        assert resolve_profit(model, 0, capacity) == pytest.approx(predicted_profit(report, 0, capacity))
+    # Сверх верхней границы процессорное время перестаёт быть дефицитным
+    assert resolve_profit(model, 0, 241) == pytest.approx(960000)
+    assert resolve_profit(model, 0, 241) != pytest.approx(predicted_profit(report, 0, 241))
+
+
+def test_first_capacity_change():
+    model = first_model()
+    report = analyze(model)
+    np.testing.assert_allclose(report.capacity_change(0, [10, -10, -20]), [960000, 920000, 880000])
+
+
+@pytest.mark.parametrize("model", list(random_models(30)))
+def test_capacity_ranges_match_resolves(model):
+    report = analyze(model)
+    for i in range(model.n_resources):
+        lower, upper = report.capacity_lower[i], report.capacity_upper[i]
+        assert lower <= model.capacity[i] + 1e-9 <= upper + 2e-9
+        for capacity in (lower, upper):
+            if np.isfinite(capacity):
+                assert resolve_profit(model, i, capacity) == pytest.approx(predicted_profit(report, i, capacity))
+        # Сразу за границей диапазона теневая цена уже не действует
+        eps = 1e-3 * (1 + model.capacity[i])
+        for capacity in (lower - eps, upper + eps):
+            if np.isfinite(capacity) and capacity >= 0:
+                assert resolve_profit(model, i, capacity) != pytest.approx(
+                    predicted_profit(report, i, capacity), rel=1e-9)
+
+
+@pytest.mark.parametrize("model", list(random_models(30, seed=1)))
+def test_capacity_change_matches_resolves(model):
+    report = analyze(model)
+    deltas = np.linspace(-40, 40, 9)
+    for i in range(model.n_resources):
+        expected = [resolve_profit(model, i, model.capacity[i] + d) for d in deltas]
+        np.testing.assert_allclose(report.capacity_change(i, deltas), expected, rtol=1e-7)
+
+
+@pytest.mark.parametrize("model", list(random_models(30, seed=2)))
+def test_profit_ranges_keep_plan(model):
+    report = analyze(model)
+    x = report.result.x
+    for j in range(model.n_products):
+        lower, upper = report.profit_lower[j], report.profit_upper[j]
+        assert lower <= model.profit[j] + 1e-9 <= upper + 2e-9
+        eps = 1e-3 * (1 + abs(model.profit[j]))
+        for price, same in ((lower + eps, True), (upper - eps, True), (lower - eps, False), (upper + eps, False)):
+            if not np.isfinite(price) or price <= 0 or (same and not lower + eps <= price <= upper - eps):
+                continue
+            profit = model.profit.copy()
+            profit[j] = price
+            assert np.allclose(model.solve(profit=profit).x, x, atol=1e-6) == same
@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+from model import ProductionModel
+from sensitivity import analyze
+from sweep import collect, grid, production_sweep, transport_sweep
+from transport import TransportationProblem
+
+
+def first_model():
+    return ProductionModel([8000, 12000], [[2, 3], [4, 6], [1, 2]], [240, 480, 150])
+
+
+def random_model(seed):
+    rng = np.random.default_rng(seed)
+    return ProductionModel(rng.uniform(1, 10, 4), rng.uniform(0.5, 5, (3, 4)), rng.uniform(50, 100, 3))
+
+
+def transport_problem():
+    cost = [[4, 8, 1, 6], [6, 3, 2, 7], [5, 9, 4, 3]]
+    return TransportationProblem(cost, [120, 150, 130], [100, 110, 90, 100])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_production_sweep_matches_solve(seed):
+    model = random_model(seed)
+    rng = np.random.default_rng(100 + seed)
+    capacities = model.capacity * rng.uniform(0.5, 1.5, (57, model.n_resources))
+    profits = model.profit * rng.uniform(0.5, 1.5, (57, model.n_products))
+    records = collect(production_sweep(model, capacities=capacities, profits=profits, chunk=10))
+
+    assert np.array_equal(records['scenario'], np.arange(57))
+    for s, record in enumerate(records):
+        expected = model.solve(profit=profits[s], capacity=capacities[s])
+        assert record['status'] == expected.status
+        assert record['profit'] == pytest.approx(expected.profit, rel=1e-7)
+        assert profits[s] @ record['x'] == pytest.approx(expected.profit, rel=1e-7)
+        assert (model.usage @ record['x'] <= capacities[s] + 1e-6).all()
+
+
+def test_production_warm_flags_follow_ranges():
+    model = random_model(0)
+    report = analyze(model)
+    # Запас первого ресурса внутри диапазона устойчивости - базис сохраняется, за ним - нет
+    lower, upper = report.capacity_lower[0], report.capacity_upper[0]
+    inside = np.linspace(lower, min(upper, 2 * model.capacity[0]), 5)[1:-1]
+    outside = [v for v in (lower - 5, upper + 5) if np.isfinite(v) and v >= 0]
+    capacities = np.tile(model.capacity, (len(inside) + len(outside), 1))
+    capacities[:, 0] = np.concatenate([inside, outside])
+    records = collect(production_sweep(model, capacities=capacities))
+    assert records['warm'][:len(inside)].all()
+    assert not records['warm'][len(inside):].any()
+
+
+def test_production_sweep_grid_and_workers():
+    model = first_model()
+    capacities = grid(model.capacity, {0: np.arange(-20, 21, 5), 2: np.arange(-10, 11, 5)})
+    serial = collect(production_sweep(model, capacities=capacities, chunk=7))
+    parallel = collect(production_sweep(model, capacities=capacities, chunk=7, workers=2))
+    assert len(serial) == 9 * 5
+    np.testing.assert_allclose(serial['profit'], parallel['profit'])
+    np.testing.assert_allclose(serial['profit'], model.solve_batch(capacities=capacities).profit)
+
+
+def test_production_sweep_infeasible_base():
+    model = ProductionModel([1, 1], [[1, 1], [-1, -1]], [10, -20])
+    capacities = np.array([[10, -20], [10, -5]])
+    records = collect(production_sweep(model, capacities=capacities))
+    assert not records['warm'].any()
+    assert records['status'][0] == model.solve().status != 0
+    assert records['status'][1] == 0
+
+
+def transport_scenarios(problem, size=40, seed=0):
+    rng = np.random.default_rng(seed)
+    m, n = problem.n_sources, problem.n_sinks
+    supplies = problem.supply[:m] * rng.uniform(0.8, 1.2, (size, m))
+    demands = problem.demand[:n] * rng.uniform(0.8, 1.2, (size, n))
+    # Первые сценарии сбалансированы так же, как базовая задача
+    scale = rng.uniform(0.9, 1.1, 10)
+    supplies[:10] = problem.supply[:m] * scale[:, None]
+    demands[:10] = problem.demand[:n] * scale[:, None]
+    return supplies, demands
+
+
+def expected_cost(problem, cost, supply, demand):
+    return TransportationProblem(cost, supply, demand, shortage_cost=problem.shortage_cost,
+                                 surplus_cost=problem.surplus_cost).solve('highs').cost
+
+
+@pytest.mark.parametrize("shared_costs", [True, False])
+def test_transport_sweep_matches_solve(shared_costs):
+    problem = transport_problem()
+    m, n = problem.n_sources, problem.n_sinks
+    supplies, demands = transport_scenarios(problem)
+    if shared_costs:
+        costs = None
+        cost_of = lambda s: problem.cost
+    else:
+        rng = np.random.default_rng(1)
+        costs = problem.cost * rng.uniform(0.8, 1.2, (len(supplies), m, n))
+        costs[:5] = problem.cost
+        cost_of = lambda s: costs[s]
+    records = collect(transport_sweep(problem, costs=costs, supplies=supplies, demands=demands, chunk=7))
+
+    assert np.array_equal(records['scenario'], np.arange(len(supplies)))
+    assert (records['status'] == 0).all()
+    for s, record in enumerate(records):
+        assert record['cost'] == pytest.approx(expected_cost(problem, cost_of(s), supplies[s], demands[s]))
+    # Пропорциональное изменение запасов и потребностей сохраняет базис
+    assert records['warm'][:10].all()
+
+
+def test_transport_sweep_balancing_changes():
+    problem = transport_problem()
+    m, n = problem.n_sources, problem.n_sinks
+    supply, demand = problem.supply[:m], problem.demand[:n]
+    supplies = np.array([supply, supply + [30, 0, 0], supply, supply * 0.9])
+    demands = np.array([demand, demand, demand + [0, 0, 0, 40], demand * 0.9])
+    records = collect(transport_sweep(problem, supplies=supplies, demands=demands, chunk=3))
+
+    # Сценарии с фиктивным складом или фиктивной базой не могут стартовать с базиса сбалансированной задачи
+    assert records['warm'].tolist() == [True, False, False, True]
+    for s, record in enumerate(records):
+        assert record['cost'] == pytest.approx(expected_cost(problem, problem.cost, supplies[s], demands[s]))
+
+
+def test_transport_sweep_unbalanced_base():
+    problem = TransportationProblem([[4, 8, 1], [6, 3, 2]], [100, 80], [60, 70, 90], shortage_cost=10)
+    supplies = np.array([[100, 80], [110, 80], [100, 100], [150, 150]])
+    records = collect(transport_sweep(problem, supplies=supplies, chunk=2))
+    assert records['warm'][0] and not records['warm'][3]
+    for s, record in enumerate(records):
+        assert record['cost'] == pytest.approx(expected_cost(problem, problem.cost[:2, :3], supplies[s], problem.demand))
+
+
+def test_transport_sweep_rejects_mismatched_costs():
+    problem = transport_problem()
+    supplies, demands = transport_scenarios(problem, size=12)
+    with pytest.raises(ValueError):
+        collect(transport_sweep(problem, costs=np.tile(problem.cost, (3, 1, 1)),
+                                supplies=supplies, demands=demands))
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from transport import TransportationProblem
+
+TOL = 1e-6
+
+
+def random_problem(seed, balance="balanced"):
+    """Случайная задача с целыми данными; balance: balanced, shortage (нехватка запасов), surplus."""
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 9, size=2)
+    cost = rng.integers(1, 20, size=(m, n)).astype(float)
+    supply = rng.integers(10, 60, size=m).astype(float)
+    demand = rng.multinomial(int(supply.sum()), np.ones(n) / n).astype(float)
+    if balance == "shortage":
+        demand[rng.integers(n)] += rng.integers(1, 30)
+    elif balance == "surplus":
+        supply[rng.integers(m)] += rng.integers(1, 30)
+    return TransportationProblem(cost, supply, demand, shortage_cost=float(rng.integers(0, 30)),
+                                 surplus_cost=float(rng.integers(0, 5)))
+
+
+CASES = [(seed, balance) for balance in ("balanced", "shortage", "surplus") for seed in range(15)]
+
+
+@pytest.fixture(params=CASES, ids=[f"{balance}-{seed}" for seed, balance in CASES])
+def problem(request):
+    return random_problem(*request.param)
+
+
+def test_network_matches_highs(problem):
+    network = problem.solve("network")
+    highs = problem.solve("highs")
+    assert network.success and highs.success
+    assert network.cost == pytest.approx(highs.cost, abs=TOL)
+
+
+def test_network_plan_is_feasible(problem):
+    result = problem.solve("network")
+    m, n = problem.n_sources, problem.n_sinks
+    supply, demand = problem.supply[:m], problem.demand[:n]
+    assert result.flow.min() >= -TOL
+    np.testing.assert_allclose(result.flow.sum(axis=1) + result.surplus, supply, atol=TOL)
+    np.testing.assert_allclose(result.flow.sum(axis=0) + result.shortage, demand, atol=TOL)
+    assert not (result.shortage > TOL).any() or problem.dummy_source
+    assert not (result.surplus > TOL).any() or problem.dummy_sink
+
+
+@pytest.mark.parametrize("method", ["network", "highs"])
+def test_potentials_and_reduced_costs(problem, method):
+    result = problem.solve(method)
+    m, n = problem.n_sources, problem.n_sinks
+    cost = problem.cost[:m, :n]
+    assert result.u[0] == 0
+    np.testing.assert_allclose(result.reduced_costs, cost - result.u[:, None] - result.v[None, :], atol=TOL)
+    # Оптимальность: ни один маршрут не удешевляет план, перевозки идут только по маршрутам с нулевой оценкой
+    assert result.reduced_costs.min() >= -TOL
+    assert np.abs(result.flow * result.reduced_costs).max() <= TOL
+
+    basis = result.basis
+    assert len(basis) == sum(problem.shape) - 1
+    assert len({tuple(cell) for cell in basis}) == len(basis)
+    real = (basis[:, 0] < m) & (basis[:, 1] < n)
+    np.testing.assert_allclose(result.reduced_costs[basis[real, 0], basis[real, 1]], 0, atol=TOL)
+    used = np.argwhere(result.flow > TOL)
+    basic = {tuple(cell) for cell in basis}
+    assert all(tuple(cell) in basic for cell in used)
+
+
+def test_warm_start_from_own_basis(problem):
+    result = problem.solve("network")
+    again = problem.solve("network", warm_start=result)
+    assert again.cost == pytest.approx(result.cost, abs=TOL)
+
+
+def resolve_cost(problem, i, j, new_cost):
+    cost = problem.cost.copy()
+    cost[i, j] = new_cost
+    return TransportationProblem(cost, problem.supply, problem.demand).solve("highs").cost
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_route_cost_range(seed):
+    problem = random_problem(seed)
+    result = problem.solve("network")
+    m, n = problem.shape
+    # В вырожденном плане смена базиса может не менять стоимость,
+    # поэтому точность границ проверяется только для невырожденных планов
+    degenerate = (result.flow[result.basis[:, 0], result.basis[:, 1]] <= TOL).any()
+    for i in range(m):
+        for j in range(n):
+            c = problem.cost[i, j]
+            low, high = problem.route_cost_range(result, i, j)
+            assert low <= c + TOL and c - TOL <= high
+            # Внутри диапазона план не меняется: стоимость линейна по c_ij
+            for new_cost in (low, (low + c) / 2, c, min(high, c + 50)):
+                if np.isfinite(new_cost):
+                    expected = result.cost + result.flow[i, j] * (new_cost - c)
+                    assert resolve_cost(problem, i, j, new_cost) == pytest.approx(expected, abs=TOL)
+            # Сразу за нижней границей маршрут выгоднее текущего плана
+            if np.isfinite(low) and not degenerate:
+                new_cost = low - 0.5
+                expected = result.cost + result.flow[i, j] * (new_cost - c)
+                assert resolve_cost(problem, i, j, new_cost) < expected - TOL
+            for new_cost in (low - 1, c + 3, high + 1):
+                if np.isfinite(new_cost):
+                    assert problem.route_cost_change(result, i, j, new_cost) == pytest.approx(
+                        resolve_cost(problem, i, j, new_cost), abs=TOL)
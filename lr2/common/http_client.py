@@ -0,0 +1,66 @@
+"""
+Общий HTTP-клиент для сервисов lr2.
+Сессия держит пул соединений к каждому хосту (keep-alive), поэтому
+повторные обращения к сервису не открывают новое TCP-соединение.
+Размер пула ограничен: при нехватке соединений запрос ждёт свободное,
+а не открывает лишнее. Неудачные обращения повторяются с
+экспоненциальной задержкой, у каждого запроса есть таймаут по умолчанию.
+
+Параметры по умолчанию задаются переменными окружения:
+HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_BACKOFF, CONNECT_TIMEOUT, READ_TIMEOUT.
+"""
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Соединений, которые держатся открытыми к одному хосту
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+# Число повторов и множитель задержки между ними: backoff * 2 ** (номер повтора - 1) секунд
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.1"))
+# Таймауты (секунды): на установку соединения и на ожидание ответа
+CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "1"))
+READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "5"))
+
+# Ответы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class Session(requests.Session):
+    """Сессия, подставляющая таймаут в каждый запрос, если он не указан явно."""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size=POOL_SIZE, retries=RETRIES, backoff=BACKOFF,
+                   timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+    """
+    Создать сессию с пулом соединений и повторами.
+    - **pool_size**: соединений к одному хосту; обычно равно числу потоков, которые делают запросы
+    - **retries**: число повторов; ошибки соединения повторяются для любых запросов,
+      ошибки чтения и ответы RETRY_STATUSES - только для идемпотентных (GET, PUT, DELETE...),
+      чтобы POST не выполнился дважды
+    - **backoff**: множитель экспоненциальной задержки между повторами
+    - **timeout**: таймаут по умолчанию, (соединение, ответ)
+    Созданную сессию нужно переиспользовать на протяжении всей работы процесса.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        # Последний ответ возвращается как есть, чтобы сервис мог передать ошибку дальше
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+    session = Session(timeout)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
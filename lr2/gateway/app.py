@@ -1,22 +1,62 @@
 from flask import Flask, request, jsonify
 import requests
-from multiprocessing import Process, Queue
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from threading import BoundedSemaphore
 import os
 
+from http_client import create_session
+
 app = Flask(__name__)
 
 WEATHER_URL = os.getenv("WEATHER_URL", "http://localhost:5000/weather")
 RECOMMEND_URL = os.getenv("RECOMMEND_URL", "http://localhost:5001/recommend")
 HISTORY_URL = os.getenv("HISTORY_URL", "http://localhost:5002/history")
+RECOMMEND_BATCH_URL = os.getenv("RECOMMEND_BATCH_URL", RECOMMEND_URL + "/batch")
+
+# Потоки для параллельных запросов и соединения, которые держатся открытыми к каждому сервису
+WORKERS = int(os.getenv("GATEWAY_WORKERS", "16"))
+# Пакетный запрос: наибольшее число городов и одновременных обращений к сервисам на один запрос
+MAX_BATCH = int(os.getenv("MAX_BATCH", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+# Сколько секунд ждать результата вызова из пула; больше таймаутов HTTP-клиента с повторами,
+# но ограничивает ожидание, если вызов застрял в очереди занятого пула
+RESULT_TIMEOUT = float(os.getenv("RESULT_TIMEOUT", "15"))
+
+# Одна сессия на процесс: соединения к сервисам переиспользуются (keep-alive),
+# таймауты и повторы задаются в http_client
+session = create_session(pool_size=WORKERS)
+# Общий пул потоков вместо запуска процессов на каждый входящий запрос
+executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="gateway")
 
 
-def get_weather(city, queue):
-    response = requests.get(WEATHER_URL, params={"city": city})
-    queue.put(response.json())
+def get_weather(city):
+    response = session.get(WEATHER_URL, params={"city": city})
+    return response.status_code, response.json()
 
 
 def save_history(city):
-    requests.post(HISTORY_URL, json={"city": city})
+    session.post(HISTORY_URL, json={"city": city})
+
+
+def fan_out(calls, limit):
+    """
+    Выполнить вызовы (функция, аргумент) в общем пуле потоков, держа
+    одновременно не больше limit из них; возвращает список Future в том же порядке.
+    """
+    slots = BoundedSemaphore(limit)
+    futures = []
+    for func, arg in calls:
+        slots.acquire()
+        future = executor.submit(func, arg)
+        future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+    return futures
+
+
+def service_error(name, exc):
+    if isinstance(exc, (requests.Timeout, FutureTimeout)):
+        return f"{name} service timeout"
+    return f"{name} service unavailable"
 
 
 @app.route("/full-weather")
@@ -25,25 +65,37 @@ def full_weather():
     if not city:
         return jsonify({"error": "city required"}), 400
 
-    queue = Queue()
-
-    # Получаем погоду и сохраняем историю
-    p1 = Process(target=get_weather, args=(city, queue))
-    p2 = Process(target=save_history, args=(city,))
-
-    p1.start()
-    p2.start()
+    # Получаем погоду и сохраняем историю одновременно
+    weather_call = executor.submit(get_weather, city)
+    history_call = executor.submit(save_history, city)
 
-    p1.join()
-    p2.join()
-
-    weather = queue.get()
+    try:
+        status, weather = weather_call.result(timeout=RESULT_TIMEOUT)
+    except (requests.Timeout, FutureTimeout):
+        return jsonify({"error": "weather service timeout"}), 504
+    except requests.RequestException:
+        return jsonify({"error": "weather service unavailable"}), 502
+    if status != 200:
+        return jsonify(weather), status
 
     # Получаем рекомендации
-    recommendations = requests.post(
-        RECOMMEND_URL,
-        json=weather
-    ).json()
+    try:
+        recommendations = session.post(
+            RECOMMEND_URL,
+            json=weather
+        ).json()
+    except requests.Timeout:
+        return jsonify({"error": "recommendation service timeout"}), 504
+    except requests.RequestException:
+        return jsonify({"error": "recommendation service unavailable"}), 502
+
+    # История не влияет на ответ: её сбой только записывается в журнал
+    try:
+        history_call.result(timeout=RESULT_TIMEOUT)
+    except requests.RequestException as exc:
+        app.logger.warning("history service: %s", exc)
+    except FutureTimeout:
+        app.logger.warning("history service: no result in %s s", RESULT_TIMEOUT)
 
     return jsonify({
         "Погода": weather,
@@ -51,5 +103,86 @@ def full_weather():
     })
 
 
+@app.route("/full-weather/batch", methods=["GET", "POST"])
+def full_weather_batch():
+    """
+    Погода и рекомендации для нескольких городов одним запросом.
+    Города передаются как ?city=A&city=B или телом {"cities": ["A", "B"]}.
+    У каждого элемента ответа есть поле "city". Ошибка по одному городу не прерывает
+    остальные: у такого города в ответе поле "error".
+    """
+    if request.method == "POST":
+        body = request.get_json(silent=True)
+        cities = body.get("cities") if isinstance(body, dict) else None
+    else:
+        cities = request.args.getlist("city")
+    if not isinstance(cities, list) or not cities or not all(isinstance(city, str) and city for city in cities):
+        return jsonify({"error": "cities required"}), 400
+    # Повторы одного города запрашиваются один раз
+    cities = list(dict.fromkeys(cities))
+    if len(cities) > MAX_BATCH:
+        return jsonify({"error": f"at most {MAX_BATCH} cities per request"}), 400
+
+    # Погода и история для всех городов одновременно, но не больше BATCH_CONCURRENCY
+    # вызовов сразу; вызовы чередуются, чтобы оба вида шли параллельно с первого города
+    calls = [(func, city) for city in cities for func in (get_weather, save_history)]
+    futures = fan_out(calls, max(1, BATCH_CONCURRENCY))
+    weather_calls, history_calls = futures[0::2], futures[1::2]
+
+    results = []
+    found = []
+    for city, call in zip(cities, weather_calls):
+        try:
+            status, weather = call.result(timeout=RESULT_TIMEOUT)
+        except (requests.RequestException, FutureTimeout) as exc:
+            results.append({"city": city, "error": service_error("weather", exc)})
+            continue
+        if status != 200:
+            error = weather.get("error") if isinstance(weather, dict) else None
+            results.append({"city": city, "error": error or f"weather service error {status}"})
+            continue
+        results.append({"city": city, "Погода": weather})
+        found.append(results[-1])
+
+    # Рекомендации для всех найденных городов одним запросом
+    if found:
+        error = None
+        try:
+            response = session.post(
+                RECOMMEND_BATCH_URL,
+                json=[result["Погода"] for result in found]
+            )
+            reply = response.json() if response.status_code == 200 else None
+        except requests.RequestException as exc:
+            error = service_error("recommendation", exc)
+        else:
+            # Ответ должен содержать по списку рекомендаций на каждый город
+            recommendations = reply.get("recommendations") if isinstance(reply, dict) else None
+            if not isinstance(recommendations, list) or len(recommendations) != len(found):
+                app.logger.warning("recommendation service: unexpected batch reply (status %s)",
+                                   response.status_code)
+                error = "recommendation service unavailable"
+        if error is None:
+            for result, items in zip(found, recommendations):
+                # Запись, которую сервис рекомендаций не принял, помечается ошибкой только у своего города
+                if isinstance(items, dict):
+                    result["error"] = f"recommendation service: {items.get('error')}"
+                else:
+                    result["Рекомендации"] = items
+        else:
+            for result in found:
+                result["error"] = error
+
+    for call in history_calls:
+        try:
+            call.result(timeout=RESULT_TIMEOUT)
+        except requests.RequestException as exc:
+            app.logger.warning("history service: %s", exc)
+        except FutureTimeout:
+            app.logger.warning("history service: no result in %s s", RESULT_TIMEOUT)
+
+    return jsonify({"results": results})
+
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000)
+    app.run(host="0.0.0.0", port=8000, threaded=True)
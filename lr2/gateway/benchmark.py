@@ -0,0 +1,126 @@
+"""
+Сравнение обработки /full-weather: прежний вариант с запуском двух процессов
+на каждый запрос и текущий с общим пулом потоков и пулом соединений.
+
+Сервисы погоды, истории и рекомендаций заменяются заглушками в отдельном
+процессе, поэтому для замера не нужны ни docker-compose, ни ключ OpenWeatherMap.
+
+Пример:
+    python benchmark.py --requests 200 --concurrency 8 --delay 0.02
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Process, Queue
+
+import requests
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+import app as gateway
+
+STUB_PORT = 5099
+
+
+def run_stubs(port, delay):
+    """Заглушки трёх сервисов на одном порту; delay - задержка ответа в секундах."""
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    stubs = Flask("stubs")
+
+    @stubs.route("/weather")
+    def weather():
+        time.sleep(delay)
+        return jsonify({"city": request.args["city"], "temperature": 12.5, "weather": "облачно"})
+
+    @stubs.route("/history", methods=["POST"])
+    def history():
+        time.sleep(delay)
+        return jsonify({"status": "saved"})
+
+    @stubs.route("/recommend", methods=["POST"])
+    def recommend():
+        time.sleep(delay)
+        return jsonify({"recommendations": ["Температура комфортная"]})
+
+    make_server("127.0.0.1", port, stubs, threaded=True).serve_forever()
+
+
+# Прежняя реализация обработчика, как она была до перехода на пул потоков
+def legacy_get_weather(city, queue):
+    response = requests.get(gateway.WEATHER_URL, params={"city": city})
+    queue.put(response.json())
+
+
+def legacy_save_history(city):
+    requests.post(gateway.HISTORY_URL, json={"city": city})
+
+
+def legacy_full_weather():
+    city = request.args.get("city")
+    queue = Queue()
+    p1 = Process(target=legacy_get_weather, args=(city, queue))
+    p2 = Process(target=legacy_save_history, args=(city,))
+    p1.start()
+    p2.start()
+    p1.join()
+    p2.join()
+    weather = queue.get()
+    recommendations = requests.post(gateway.RECOMMEND_URL, json=weather).json()
+    return jsonify({"Погода": weather, "Рекомендации": recommendations["recommendations"]})
+
+
+gateway.app.add_url_rule("/full-weather-legacy", view_func=legacy_full_weather)
+
+
+def measure(path, total, concurrency):
+    """Отправить total запросов в concurrency потоков; возвращает (запросов в секунду, задержки в мс)."""
+    client = gateway.app.test_client()
+
+    def call(i):
+        start = time.perf_counter()
+        response = client.get(path, query_string={"city": f"Город {i % 50}"})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        latencies = sorted(pool.map(call, range(total)))
+    elapsed = time.perf_counter() - start
+    return total / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение процессов и пула потоков в gateway")
+    parser.add_argument("--requests", type=int, default=200, help="число запросов на вариант")
+    parser.add_argument("--concurrency", type=int, default=8, help="число одновременных клиентов")
+    parser.add_argument("--delay", type=float, default=0.0, help="задержка ответа заглушек, с")
+    args = parser.parse_args()
+
+    stubs = Process(target=run_stubs, args=(STUB_PORT, args.delay), daemon=True)
+    stubs.start()
+    base = f"http://127.0.0.1:{STUB_PORT}"
+    gateway.WEATHER_URL = f"{base}/weather"
+    gateway.HISTORY_URL = f"{base}/history"
+    gateway.RECOMMEND_URL = f"{base}/recommend"
+    for _ in range(50):
+        try:
+            requests.get(f"{base}/weather", params={"city": "x"}, timeout=1)
+            break
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    print(f"{'вариант':>10} {'запр/с':>8} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+    for name, path in [("процессы", "/full-weather-legacy"), ("потоки", "/full-weather")]:
+        measure(path, min(20, args.requests), args.concurrency)
+        rps, latencies = measure(path, args.requests, args.concurrency)
+        p50, p95, p99 = (latencies[int(q * (len(latencies) - 1))] for q in (0.5, 0.95, 0.99))
+        print(f"{name:>10} {rps:8.1f} {p50:8.1f} {p95:8.1f} {p99:8.1f}")
+    stubs.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import importlib.util
+import os
+import sys
+import threading
+
+import pytest
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# В контейнере http_client копируется рядом с app.py
+sys.path.insert(0, os.path.join(HERE, "..", "common"))
+# Модуль загружается под своим именем: app.py есть в каждом сервисе
+spec = importlib.util.spec_from_file_location("gateway_app", os.path.join(HERE, "app.py"))
+gateway = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gateway)
+
+WEATHER = {
+    "Москва": {"city": "Москва", "weather": "дождь", "temperature": 3},
+    "Сочи": {"city": "Сочи", "weather": "ясно", "temperature": 30},
+}
+
+
+class StubResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class StubSession:
+    """Заглушка HTTP-сессии: отвечает за сервисы погоды, истории и рекомендаций."""
+
+    def __init__(self):
+        self.history = []
+        self.recommend = self.recommend_ok
+        self.weather_error = None
+        # Пока событие не установлено, запрос погоды «висит»
+        self.weather_ready = threading.Event()
+        self.weather_ready.set()
+
+    def get(self, url, params):
+        city = params["city"]
+        self.weather_ready.wait(5)
+        if self.weather_error is not None:
+            raise self.weather_error
+        if city not in WEATHER:
+            return StubResponse(404, {"error": f"city {city} not found"})
+        return StubResponse(200, WEATHER[city])
+
+    def post(self, url, json):
+        if url == gateway.HISTORY_URL:
+            self.history.append(json["city"])
+            return StubResponse(201, {})
+        return self.recommend(url, json)
+
+    @staticmethod
+    def recommend_ok(url, items):
+        if url == gateway.RECOMMEND_BATCH_URL:
+            return StubResponse(200, {"recommendations": [[item["weather"]] for item in items]})
+        return StubResponse(200, {"recommendations": [items["weather"]]})
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = StubSession()
+    monkeypatch.setattr(gateway, "session", session)
+    return session
+
+
+@pytest.fixture
+def client():
+    return gateway.app.test_client()
+
+
+def batch(client, cities):
+    response = client.post("/full-weather/batch", json={"cities": cities})
+    assert response.status_code == 200
+    return response.get_json()["results"]
+
+
+def test_full_weather(client, session):
+    response = client.get("/full-weather", query_string={"city": "Москва"})
+    assert response.status_code == 200
+    assert response.get_json() == {"Погода": WEATHER["Москва"], "Рекомендации": ["дождь"]}
+    assert session.history == ["Москва"]
+
+
+def test_full_weather_errors(client, session):
+    assert client.get("/full-weather").status_code == 400
+    assert client.get("/full-weather", query_string={"city": "Атлантида"}).status_code == 404
+    session.weather_error = requests.Timeout()
+    assert client.get("/full-weather", query_string={"city": "Москва"}).status_code == 504
+    session.weather_error = requests.ConnectionError()
+    assert client.get("/full-weather", query_string={"city": "Москва"}).status_code == 502
+
+
+def test_full_weather_result_timeout(client, session, monkeypatch):
+    monkeypatch.setattr(gateway, "RESULT_TIMEOUT", 0.05)
+    session.weather_ready.clear()
+    try:
+        response = client.get("/full-weather", query_string={"city": "Москва"})
+        assert response.status_code == 504
+        assert response.get_json() == {"error": "weather service timeout"}
+        response = client.post("/full-weather/batch", json={"cities": ["Москва"]})
+        assert response.get_json()["results"] == [{"city": "Москва", "error": "weather service timeout"}]
+    finally:
+        session.weather_ready.set()
+
+
+def test_batch_every_entry_has_city(client, session):
+    results = batch(client, ["Москва", "Атлантида", "Сочи", "Москва"])
+    assert [result["city"] for result in results] == ["Москва", "Атлантида", "Сочи"]
+    assert results[0] == {"city": "Москва", "Погода": WEATHER["Москва"], "Рекомендации": ["дождь"]}
+    assert results[1] == {"city": "Атлантида", "error": "city Атлантида not found"}
+    assert results[2]["Рекомендации"] == ["ясно"]
+    assert sorted(session.history) == ["Атлантида", "Москва", "Сочи"]
+
+
+def test_batch_query_string(client, session):
+    response = client.get("/full-weather/batch", query_string=[("city", "Сочи"), ("city", "Москва")])
+    assert [result["city"] for result in response.get_json()["results"]] == ["Сочи", "Москва"]
+
+
+def test_batch_weather_service_down(client, session):
+    session.weather_error = requests.Timeout()
+    results = batch(client, ["Москва", "Сочи"])
+    assert results == [{"city": "Москва", "error": "weather service timeout"},
+                       {"city": "Сочи", "error": "weather service timeout"}]
+
+
+@pytest.mark.parametrize("reply", [
+    StubResponse(500, {"error": "boom"}),
+    StubResponse(200, {"recommendations": [["одна"]]}),
+    StubResponse(200, ["не объект"]),
+])
+def test_batch_bad_recommendation_reply(client, session, reply):
+    session.recommend = lambda url, items: reply
+    results = batch(client, ["Москва", "Сочи"])
+    assert results == [{"city": city, "Погода": WEATHER[city], "error": "recommendation service unavailable"}
+                       for city in ("Москва", "Сочи")]
+
+
+def test_batch_recommendation_item_error(client, session):
+    session.recommend = lambda url, items: StubResponse(200, {"recommendations": [
+        {"error": "field 'temperature' must be a number"}, ["ясно"]]})
+    results = batch(client, ["Москва", "Сочи"])
+    assert results[0]["city"] == "Москва"
+    assert results[0]["error"] == "recommendation service: field 'temperature' must be a number"
+    assert "Рекомендации" not in results[0]
+    assert results[1]["Рекомендации"] == ["ясно"]
+
+
+@pytest.mark.parametrize("body", [None, {}, {"cities": []}, {"cities": "Москва"}, {"cities": ["Москва", ""]}])
+def test_batch_bad_request(client, session, body):
+    assert client.post("/full-weather/batch", json=body).status_code == 400
+
+
+def test_batch_limit(client, session, monkeypatch):
+    monkeypatch.setattr(gateway, "MAX_BATCH", 1)
+    assert client.post("/full-weather/batch", json={"cities": ["Москва", "Сочи"]}).status_code == 400
@@ -1,18 +1,27 @@
 from flask import Flask, request, jsonify
-from collections import Counter
+import os
+
+from history_store import HistoryStore, WINDOWS
 
 app = Flask(__name__)
-history = []
+
+# Файл базы истории; в docker-compose он лежит на томе и переживает перезапуск
+HISTORY_DB = os.getenv("HISTORY_DB", "history.db")
+store = HistoryStore(HISTORY_DB)
 
 @app.route("/history", methods=["POST"])
 def save():
     city = request.json["city"]
-    history.append(city)
+    store.add(city)
     return jsonify({"status": "saved"})
 
 @app.route("/history", methods=["GET"])
 def stats():
-    return jsonify(dict(Counter(history)))
+    """Число запросов по городам за всё время или за окно ?window=hour|day."""
+    window = request.args.get("window")
+    if window is not None and window not in WINDOWS:
+        return jsonify({"error": f"window must be one of: {', '.join(WINDOWS)}"}), 400
+    return jsonify(store.counts(window))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+"""
+Хранилище истории запросов в SQLite.
+Отдельные запросы не хранятся: при каждой записи увеличиваются счётчики
+- city_counts: всего запросов по городу;
+- city_buckets: запросов по городу за минуту и за час (корзины), из них
+  считаются запросы за последний час (60 минутных корзин) и за последние
+  сутки (24 часовые корзины).
+Поэтому объём базы и время статистики зависят от числа разных городов,
+а не от общего числа запросов. Корзины старше суток удаляются.
+"""
+import sqlite3
+import threading
+import time
+
+# Размер корзины в секундах и сколько корзин входит в окно
+WINDOWS = {
+    "hour": (60, 60),
+    "day": (3600, 24),
+}
+# Как часто (в секундах) удаляются корзины, вышедшие за пределы окон
+PRUNE_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS city_counts (
+    city TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS city_buckets (
+    size INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    city TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (size, bucket, city)
+) WITHOUT ROWID;
+"""
+
+UPSERT_COUNT = """
+INSERT INTO city_counts (city, count) VALUES (?, 1)
+ON CONFLICT (city) DO UPDATE SET count = count + 1
+"""
+UPSERT_BUCKET = """
+INSERT INTO city_buckets (size, bucket, city, count) VALUES (?, ?, ?, 1)
+ON CONFLICT (size, bucket, city) DO UPDATE SET count = count + 1
+"""
+
+
+class HistoryStore:
+    """
+    Счётчики запросов по городам. Одно соединение с базой на процесс:
+    Flask запускает поток на каждый запрос, поэтому обращения к соединению
+    выполняются под блокировкой.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Запросы выполняются в режиме автофиксации, транзакции открываются явно
+        self.conn = sqlite3.connect(path, isolation_level=None, timeout=5, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.pruned = 0.0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def add(self, city, now=None):
+        """Учесть запрос погоды для города."""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(UPSERT_COUNT, (city,))
+                for size, _ in WINDOWS.values():
+                    self.conn.execute(UPSERT_BUCKET, (size, int(now // size), city))
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            if now - self.pruned > PRUNE_INTERVAL:
+                self._prune(now)
+
+    def prune(self, now=None):
+        """Удалить корзины, которые уже не попадают ни в одно окно."""
+        with self.lock:
+            self._prune(time.time() if now is None else now)
+
+    def _prune(self, now):
+        for size, count in WINDOWS.values():
+            self.conn.execute("DELETE FROM city_buckets WHERE size = ? AND bucket <= ?",
+                              (size, int(now // size) - count))
+        self.pruned = now
+
+    def counts(self, window=None, now=None):
+        """
+        Число запросов по городам.
+        - **window**: None - за всё время, иначе ключ WINDOWS ("hour", "day")
+        """
+        if window is None:
+            query, params = "SELECT city, count FROM city_counts", ()
+        else:
+            now = time.time() if now is None else now
+            size, count = WINDOWS[window]
+            query = "SELECT city, sum(count) FROM city_buckets WHERE size = ? AND bucket > ? GROUP BY city"
+            params = (size, int(now // size) - count)
+        with self.lock:
+            return dict(self.conn.execute(query, params).fetchall())
@@ -0,0 +1,71 @@
+import random
+from collections import Counter
+
+import pytest
+
+from history_store import WINDOWS, HistoryStore
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def window_counts(events, window, now):
+    """Подсчёт перебором: события в тех же корзинах, что учитывает окно."""
+    size, count = WINDOWS[window]
+    first = int(now // size) - count + 1
+    return dict(Counter(city for t, city in events if first <= int(t // size) <= int(now // size)))
+
+
+def random_events(seed, count=3000, step=30):
+    rng = random.Random(seed)
+    cities = [f"Город {i}" for i in range(12)]
+    t = START
+    for _ in range(count):
+        t += rng.uniform(0, 2 * step)
+        yield t, rng.choice(cities)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_replay_matches_brute_force(store, seed):
+    events = []
+    for i, (t, city) in enumerate(random_events(seed)):
+        store.add(city, now=t)
+        events.append((t, city))
+        # Проверяем по ходу воспроизведения: окна в начале, середине и через сутки с лишним
+        if i % 500 == 499:
+            assert store.counts() == dict(Counter(city for _, city in events))
+            for window in WINDOWS:
+                assert store.counts(window, now=t) == window_counts(events, window, t)
+
+
+def test_prune_keeps_buckets_inside_windows(store):
+    events = list(random_events(7, count=2000, step=60))
+    for t, city in events:
+        store.add(city, now=t)
+    now = events[-1][0]
+    before = {window: store.counts(window, now=now) for window in WINDOWS}
+
+    store.prune(now)
+    for window in WINDOWS:
+        assert store.counts(window, now=now) == before[window]
+    # Остались только корзины, входящие в свои окна
+    for size, count in WINDOWS.values():
+        oldest = store.conn.execute(
+            "SELECT min(bucket) FROM city_buckets WHERE size = ?", (size,)).fetchone()[0]
+        assert oldest > int(now // size) - count
+    assert store.counts() == dict(Counter(city for _, city in events))
+
+
+def test_prune_runs_on_write(store):
+    store.add("Москва", now=START)
+    store.add("Москва", now=START + 2 * 86400)
+    assert store.counts("day", now=START + 2 * 86400) == {"Москва": 1}
+    assert store.counts() == {"Москва": 2}
+    rows = store.conn.execute("SELECT count(*) FROM city_buckets").fetchone()[0]
+    assert rows == len(WINDOWS)
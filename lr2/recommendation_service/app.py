@@ -2,9 +2,23 @@ from flask import Flask, request, jsonify
 
 app = Flask(__name__)
 
-@app.route("/recommend", methods=["POST"])
-def recommend():
-    data = request.json
+# Наибольшее число погодных записей в одном пакетном запросе
+MAX_BATCH = 500
+
+
+def weather_error(data):
+    """Проверить погодную запись; возвращает текст ошибки или None."""
+    if not isinstance(data, dict):
+        return "weather payload must be an object"
+    if not isinstance(data.get("weather"), str):
+        return "field 'weather' must be a string"
+    temperature = data.get("temperature")
+    if isinstance(temperature, bool) or not isinstance(temperature, (int, float)):
+        return "field 'temperature' must be a number"
+    return None
+
+
+def make_recommendations(data):
     recommendations = []
 
     if "дождь" in data["weather"]:
@@ -17,6 +31,33 @@ def recommend():
     else:
         recommendations.append("Температура комфортная")
 
+    return recommendations
+
+
+@app.route("/recommend", methods=["POST"])
+def recommend():
+    data = request.get_json(silent=True)
+    error = weather_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    return jsonify({"recommendations": make_recommendations(data)})
+
+
+@app.route("/recommend/batch", methods=["POST"])
+def recommend_batch():
+    """
+    Рекомендации для списка погодных записей; ответ в том же порядке.
+    Некорректная запись не прерывает остальные: на её месте {"error": "..."}.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return jsonify({"error": "list of weather payloads required"}), 400
+    if len(items) > MAX_BATCH:
+        return jsonify({"error": f"at most {MAX_BATCH} items per request"}), 400
+    recommendations = []
+    for data in items:
+        error = weather_error(data)
+        recommendations.append({"error": error} if error else make_recommendations(data))
     return jsonify({"recommendations": recommendations})
 
 
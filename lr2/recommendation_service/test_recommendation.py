@@ -0,0 +1,58 @@
+import importlib.util
+import os
+
+import pytest
+
+# Модуль загружается под своим именем: app.py есть в каждом сервисе
+spec = importlib.util.spec_from_file_location(
+    "recommendation_app", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"))
+recommendation = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(recommendation)
+
+
+@pytest.fixture
+def client():
+    return recommendation.app.test_client()
+
+
+def test_recommend(client):
+    response = client.post("/recommend", json={"weather": "дождь", "temperature": 3})
+    assert response.status_code == 200
+    assert response.get_json() == {"recommendations": ["Возьмите зонт ☔", "Одевайтесь теплее 🧥"]}
+
+
+@pytest.mark.parametrize("payload", [None, [], {"weather": "ясно"}, {"weather": 1, "temperature": 20},
+                                     {"weather": "ясно", "temperature": "20"}, {"weather": "ясно", "temperature": True}])
+def test_recommend_rejects_invalid(client, payload):
+    response = client.post("/recommend", json=payload)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_batch_keeps_order(client):
+    items = [{"weather": "ясно", "temperature": 30}, {"weather": "дождь", "temperature": 15}]
+    response = client.post("/recommend/batch", json=items)
+    assert response.status_code == 200
+    assert response.get_json() == {"recommendations": [
+        recommendation.make_recommendations(item) for item in items]}
+
+
+def test_batch_reports_invalid_items(client):
+    items = [{"weather": "ясно", "temperature": 30}, "Москва", {"weather": "ясно"},
+             {"weather": "дождь", "temperature": 0.5}]
+    response = client.post("/recommend/batch", json=items)
+    assert response.status_code == 200
+    recommendations = response.get_json()["recommendations"]
+    assert len(recommendations) == len(items)
+    assert recommendations[0] == ["Очень жарко, не забудьте водичку 💧"]
+    assert recommendations[1] == {"error": "weather payload must be an object"}
+    assert recommendations[2] == {"error": "field 'temperature' must be a number"}
+    assert recommendations[3] == ["Возьмите зонт ☔", "Одевайтесь теплее 🧥"]
+
+
+def test_batch_rejects_bad_request(client, monkeypatch):
+    assert client.post("/recommend/batch", json={"weather": "ясно"}).status_code == 400
+    assert client.post("/recommend/batch", data="не JSON", content_type="application/json").status_code == 400
+    monkeypatch.setattr(recommendation, "MAX_BATCH", 2)
+    response = client.post("/recommend/batch", json=[{"weather": "ясно", "temperature": 20}] * 3)
+    assert response.status_code == 400
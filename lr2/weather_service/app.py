@@ -1,18 +1,34 @@
 from flask import Flask, request, jsonify
 import requests
+import os
+
+from http_client import create_session
+from weather_cache import WeatherCache
 
 app = Flask(__name__)
 
-API_KEY = ""
-URL = "https://api.openweathermap.org/data/2.5/weather"
+API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
+URL = os.getenv("WEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather")
 
+# Кэш погоды: время свежести и время, в течение которого устаревшая запись
+# ещё отдаётся с обновлением в фоне (секунды), и наибольшее число городов
+CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+CACHE_STALE_TTL = float(os.getenv("WEATHER_CACHE_STALE_TTL", "1800"))
+CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "1000"))
 
-@app.route("/weather")
-def weather():
-    city = request.args.get("city")
-    if not city:
-        return jsonify({"error": "city required"}), 400
+# Соединение с OpenWeatherMap переиспользуется между запросами
+session = create_session()
 
+
+class WeatherAPIError(Exception):
+    """Внешний API ответил ошибкой; такой ответ не кэшируется."""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def fetch_weather(city):
     params = {
         "q": city,
         "appid": API_KEY,
@@ -20,17 +36,42 @@ def weather():
         "lang": "ru"
     }
 
-    response = requests.get(URL, params=params)
+    response = session.get(URL, params=params)
     data = response.json()
 
     if response.status_code != 200:
-        return jsonify({"error": data.get("message", "API error")}), 500
+        raise WeatherAPIError(data.get("message", "API error"))
 
-    return jsonify({
-        "city": city,
+    return {
         "temperature": data["main"]["temp"],
         "weather": data["weather"][0]["description"]
-    })
+    }
+
+
+cache = WeatherCache(fetch_weather, ttl=CACHE_TTL, stale_ttl=CACHE_STALE_TTL, maxsize=CACHE_SIZE)
+
+
+@app.route("/weather")
+def weather():
+    city = request.args.get("city")
+    if not city:
+        return jsonify({"error": "city required"}), 400
+
+    try:
+        data = cache.get(city)
+    except WeatherAPIError as exc:
+        return jsonify({"error": exc.message}), 500
+    except requests.Timeout:
+        return jsonify({"error": "weather API timeout"}), 504
+    except requests.RequestException:
+        return jsonify({"error": "weather API unavailable"}), 502
+
+    return jsonify({"city": city, **data})
+
+
+@app.route("/weather/cache")
+def cache_info():
+    return jsonify(cache.info())
 
 
 if __name__ == "__main__":
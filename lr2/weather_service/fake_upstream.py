@@ -0,0 +1,53 @@
+"""
+Локальная замена OpenWeatherMap для проверки weather_service без ключа API.
+Отвечает в формате /data/2.5/weather; температура зависит от названия города,
+город "nowhere" даёт 404. GET /calls - сколько раз запрашивался каждый город.
+
+Пример:
+    python fake_upstream.py --delay 0.2
+    WEATHER_API_URL=http://localhost:5090/data/2.5/weather PYTHONPATH=../common python app.py
+"""
+import argparse
+import threading
+import time
+import zlib
+from collections import Counter
+
+from flask import Flask, request, jsonify
+
+app = Flask(__name__)
+calls = Counter()
+calls_lock = threading.Lock()
+DELAY = 0.0
+
+
+@app.route("/data/2.5/weather")
+def weather():
+    city = request.args.get("q", "")
+    with calls_lock:
+        calls[city] += 1
+    time.sleep(DELAY)
+    if city.lower() == "nowhere":
+        return jsonify({"cod": "404", "message": "city not found"}), 404
+    seed = zlib.crc32(city.lower().encode())
+    temperature = seed % 450 / 10 - 15
+    return jsonify({
+        "name": city,
+        "main": {"temp": temperature},
+        "weather": [{"description": "небольшой дождь" if seed % 3 == 0 else "ясно"}]
+    })
+
+
+@app.route("/calls")
+def call_counts():
+    with calls_lock:
+        return jsonify(dict(calls))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Заглушка OpenWeatherMap")
+    parser.add_argument("--port", type=int, default=5090)
+    parser.add_argument("--delay", type=float, default=0.0, help="задержка ответа, с")
+    args = parser.parse_args()
+    DELAY = args.delay
+    app.run(host="127.0.0.1", port=args.port, threaded=True)
@@ -0,0 +1,132 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from weather_cache import WeatherCache
+
+
+class StubFetch:
+    """Заглушка запроса к API: считает вызовы, может задерживать ответ или падать."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+        self.error = None
+
+    def __call__(self, city):
+        with self.lock:
+            self.calls.append(city)
+            version = len(self.calls)
+        self.release.wait(5)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"temperature": version, "weather": city}
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_misses_share_one_fetch():
+    fetch = StubFetch(delay=0.2)
+    cache = WeatherCache(fetch)
+    barrier = threading.Barrier(20)
+
+    def get(_):
+        barrier.wait()
+        return cache.get("Moscow")
+
+    with ThreadPoolExecutor(20) as pool:
+        results = list(pool.map(get, range(20)))
+
+    assert fetch.calls == ["Moscow"]
+    assert all(result == results[0] for result in results)
+    info = cache.info()
+    assert info["misses"] == 1 and info["coalesced"] == 19
+
+
+def test_stale_read_returns_at_once_and_refreshes_once():
+    fetch = StubFetch()
+    cache = WeatherCache(fetch, ttl=0.05, stale_ttl=60)
+    first = cache.get("Moscow")
+    time.sleep(0.1)
+
+    # Обновление в фоне зависает, пока его не отпустят
+    fetch.release.clear()
+    for _ in range(5):
+        start = time.monotonic()
+        assert cache.get("Moscow") == first
+        assert time.monotonic() - start < 0.05
+    wait_until(lambda: len(fetch.calls) == 2)
+    assert cache.info()["stale"] == 5
+
+    fetch.release.set()
+    wait_until(lambda: not cache.inflight)
+    assert len(fetch.calls) == 2
+    assert cache.get("Moscow")["temperature"] == 2
+
+
+def test_expired_entry_is_fetched_again():
+    fetch = StubFetch()
+    cache = WeatherCache(fetch, ttl=0.02, stale_ttl=0.02)
+    cache.get("Moscow")
+    time.sleep(0.05)
+    assert cache.get("Moscow")["temperature"] == 2
+    assert len(fetch.calls) == 2
+
+
+def test_errors_are_not_cached():
+    fetch = StubFetch(delay=0.1)
+    fetch.error = RuntimeError("city not found")
+    cache = WeatherCache(fetch)
+
+    # Ошибку получают все, кто ждал общий запрос
+    with ThreadPoolExecutor(5) as pool:
+        futures = [pool.submit(cache.get, "nowhere") for _ in range(5)]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result()
+    assert "nowhere" not in cache.entries
+
+    with pytest.raises(RuntimeError):
+        cache.get("nowhere")
+    fetch.error = None
+    assert cache.get("nowhere")["weather"] == "nowhere"
+    assert len(fetch.calls) >= 3
+    assert cache.info()["errors"] == len(fetch.calls) - 1
+
+
+def test_failed_refresh_keeps_stale_entry():
+    fetch = StubFetch()
+    cache = WeatherCache(fetch, ttl=0.02, stale_ttl=60)
+    first = cache.get("Moscow")
+    time.sleep(0.05)
+    fetch.error = RuntimeError("upstream down")
+    assert cache.get("Moscow") == first
+    wait_until(lambda: not cache.inflight)
+    assert cache.get("Moscow") == first
+    assert cache.info()["errors"] >= 1
+
+
+def test_lru_eviction_order():
+    fetch = StubFetch()
+    cache = WeatherCache(fetch, maxsize=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("A")      # попадание: "a" становится самым свежим
+    cache.get("c")      # вытесняется "b"
+    assert list(cache.entries) == ["a", "c"]
+    assert fetch.calls == ["a", "b", "c"]
+
+    cache.get("b")      # снова промах, теперь вытесняется "a"
+    assert list(cache.entries) == ["c", "b"]
+    assert fetch.calls == ["a", "b", "c", "b"]
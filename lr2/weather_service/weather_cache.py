@@ -0,0 +1,100 @@
+"""
+Кэш погоды по городам.
+Погода меняется за минуты, а запросы приходятся в основном на несколько
+сотен городов, поэтому ответ внешнего API хранится и переиспользуется:
+- свежая запись (моложе ttl) отдаётся сразу;
+- устаревшая, но не старше ttl + stale_ttl, тоже отдаётся сразу, а в фоне
+  запускается обновление (stale-while-revalidate);
+- при промахе одновременные запросы одного города ждут один общий
+  запрос к API, а не отправляют каждый свой;
+- число городов ограничено, при переполнении вытесняется давно не
+  запрашивавшийся (LRU).
+Ошибки внешнего API не кэшируются.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class WeatherCache:
+    """
+    Потокобезопасный кэш результатов функции fetch(city).
+    - **fetch**: функция, запрашивающая погоду у внешнего API
+    - **ttl**: сколько секунд запись считается свежей
+    - **stale_ttl**: сколько секунд после этого запись ещё можно отдать, обновляя её в фоне
+    - **maxsize**: наибольшее число городов в кэше
+    """
+
+    def __init__(self, fetch, ttl=600, stale_ttl=1800, maxsize=1000, workers=4):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        # Запросы к API, которые выполняются сейчас: город -> Future
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.refresher = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="weather-refresh")
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    @staticmethod
+    def key(city):
+        return city.strip().lower()
+
+    def get(self, city):
+        """Погода для города из кэша или от API; ошибки API передаются вызывающему."""
+        key = self.key(city)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, fetched = entry
+                age = time.monotonic() - fetched
+                if age < self.ttl:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self.entries.move_to_end(key)
+                    self.stats["stale"] += 1
+                    if key not in self.inflight:
+                        self.inflight[key] = future = Future()
+                        self.refresher.submit(self._load, key, city, future)
+                    return value
+                del self.entries[key]
+
+            future = self.inflight.get(key)
+            if future is None:
+                self.inflight[key] = future = Future()
+                self.stats["misses"] += 1
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+
+        if leader:
+            self._load(key, city, future)
+        return future.result()
+
+    def _load(self, key, city, future):
+        """Запросить погоду у API, сохранить её и разбудить ждущие потоки."""
+        try:
+            value = self.fetch(city)
+        except BaseException as exc:
+            with self.lock:
+                self.stats["errors"] += 1
+                del self.inflight[key]
+            future.set_exception(exc)
+            return
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            del self.inflight[key]
+        future.set_result(value)
+
+    def info(self):
+        with self.lock:
+            return {**self.stats, "size": len(self.entries), "maxsize": self.maxsize,
+                    "ttl": self.ttl, "stale_ttl": self.stale_ttl}
@@ -1,19 +1,205 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import secrets
+import time
+
 from fastapi import Security, HTTPException, status
 from fastapi.security import APIKeyHeader
+from sqlalchemy import Boolean, Column, Float, Integer, String, select
+from sqlalchemy.exc import IntegrityError
+
+from database import Base, SessionLocal, init_db
 
 
-API_KEY = "secret-api-key-12345"
+# Ключ, который создаётся при первом запуске, если в базе ещё нет ни одного ключа
+API_KEY = os.getenv("API_KEY", "secret-api-key-12345")
 api_key_header = APIKeyHeader(name="X-API-Key")
 
+# Как часто (в секундах) кэш ключей перечитывается из базы, чтобы увидеть новые и отозванные ключи
+KEY_REFRESH = 30
+# Ограничение по умолчанию: запросов в секунду и размер «пачки» сверх него
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+
+# Модель таблицы ключей; сам ключ не хранится, только его хэш
+class ApiKeyDB(Base):
+    __tablename__ = "api_keys"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True)
+    key_hash = Column(String(64), nullable=False, unique=True)
+    rate = Column(Float, nullable=False, default=DEFAULT_RATE)
+    burst = Column(Integer, nullable=False, default=DEFAULT_BURST)
+    active = Column(Boolean, nullable=False, default=True)
+
+
+def hash_key(api_key):
+    """
+    SHA-256 ключа. Ключи - длинные случайные строки, поэтому медленный
+    хэш паролей не нужен, а быстрый позволяет проверять ключ на каждом запросе.
+    """
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class KeyStore:
+    """Кэш активных ключей в памяти: хэш -> (имя, скорость, пачка)."""
+
+    def __init__(self, refresh=KEY_REFRESH):
+        self.refresh = refresh
+        self.keys = {}
+        self.loaded = 0.0
+        self.lock = asyncio.Lock()
+
+    async def load(self):
+        async with SessionLocal() as db:
+            rows = await db.execute(select(ApiKeyDB.key_hash, ApiKeyDB.name, ApiKeyDB.rate, ApiKeyDB.burst)
+                                    .where(ApiKeyDB.active))
+            self.keys = {key_hash: (name, rate, burst) for key_hash, name, rate, burst in rows}
+        self.loaded = time.monotonic()
+
+    async def get(self, key_hash):
+        if time.monotonic() - self.loaded > self.refresh:
+            async with self.lock:
+                if time.monotonic() - self.loaded > self.refresh:
+                    await self.load()
+        return self.keys.get(key_hash)
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов в памяти процесса: у каждого ключа своё ведро
+    на `burst` жетонов, которое пополняется со скоростью `rate` жетонов в секунду.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+
+    async def take(self, key, rate, burst):
+        """Взять жетон; возвращает 0, если запрос разрешён, иначе сколько секунд ждать."""
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            return 0.0
+        self.buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+
+class RedisTokenBucket:
+    """Общий для всех процессов ограничитель в Redis; требует установленного пакета redis."""
+
+    # Чтение, пополнение и списание выполняются атомарно на стороне Redis
+    SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or ARGV[2])
+    local updated = tonumber(redis.call('HGET', KEYS[1], 'updated') or ARGV[3])
+    tokens = math.min(tonumber(ARGV[2]), tokens + (ARGV[3] - updated) * ARGV[1])
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / ARGV[1] end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', ARGV[3])
+    redis.call('EXPIRE', KEYS[1], math.ceil(ARGV[2] / ARGV[1]) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("Для общего ограничителя в Redis установите пакет redis") from exc
+        self.client = redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+
+    async def take(self, key, rate, burst):
+        return float(await self.script(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time()]))
+
+
+def create_limiter(url=None):
+    """Выбрать ограничитель по адресу: redis://... или ограничитель в памяти процесса."""
+    if url and url.startswith(("redis://", "rediss://")):
+        return RedisTokenBucket(url)
+    return TokenBucket()
+
+
+key_store = KeyStore()
+limiter = create_limiter(os.getenv("RATE_LIMIT_URL"))
+
+
+async def create_key(name, rate=DEFAULT_RATE, burst=DEFAULT_BURST, api_key=None):
+    """Создать ключ и сохранить его хэш; возвращает сам ключ (показывается один раз)."""
+    api_key = api_key or secrets.token_urlsafe(32)
+    async with SessionLocal() as db:
+        db.add(ApiKeyDB(name=name, key_hash=hash_key(api_key), rate=rate, burst=burst))
+        await db.commit()
+    return api_key
+
+
+async def revoke_key(name):
+    """Отозвать ключ по имени; возвращает False, если такого ключа нет."""
+    async with SessionLocal() as db:
+        key = await db.scalar(select(ApiKeyDB).where(ApiKeyDB.name == name))
+        if key is None:
+            return False
+        key.active = False
+        await db.commit()
+    return True
+
+
+async def init_keys():
+    """Загрузить ключи при запуске; в пустую таблицу добавляется ключ API_KEY."""
+    async with SessionLocal() as db:
+        empty = await db.scalar(select(ApiKeyDB.id).limit(1)) is None
+    if empty:
+        # Несколько процессов могут одновременно увидеть пустую таблицу;
+        # ключ добавит первый из них, остальным достаточно его загрузить
+        try:
+            await create_key("default", api_key=API_KEY)
+        except IntegrityError:
+            pass
+    await key_store.load()
+
 
 async def verify_api_key(api_key: str = Security(api_key_header)):
     """
     Проверка API ключа.
     Если ключ неверный, возвращается ошибка 403.
+    Если ключ превысил допустимую частоту запросов, возвращается ошибка 429.
     """
-    if api_key != API_KEY:
+    key_hash = hash_key(api_key)
+    key = await key_store.get(key_hash)
+    if key is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Неверный API ключ"
         )
+    name, rate, burst = key
+    wait = await limiter.take(key_hash, rate, burst)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Превышена частота запросов для ключа {name}",
+            headers={"Retry-After": str(max(1, round(wait)))}
+        )
     return api_key
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Управление API ключами")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="создать ключ")
+    create.add_argument("name")
+    create.add_argument("--rate", type=float, default=DEFAULT_RATE, help="запросов в секунду")
+    create.add_argument("--burst", type=int, default=DEFAULT_BURST, help="допустимая пачка запросов")
+    revoke = commands.add_parser("revoke", help="отозвать ключ")
+    revoke.add_argument("name")
+    args = parser.parse_args()
+
+    async def main():
+        await init_db()
+        if args.command == "create":
+            print(await create_key(args.name, args.rate, args.burst))
+        elif not await revoke_key(args.name):
+            print(f"Ключ {args.name} не найден")
+
+    asyncio.run(main())
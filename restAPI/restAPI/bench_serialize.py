@@ -0,0 +1,91 @@
+"""
+Микробенчмарк сериализации страницы книг.
+Сравнивает стоимость превращения страницы из базы в JSON:
+- ORM-объекты -> модель Book -> jsonable_encoder -> json (общий путь FastAPI)
+- ORM-объекты -> TypeAdapter(List[Book]) -> dump_json (путь по умолчанию)
+- строки базы -> словари -> json / orjson (путь FAST_JSON)
+
+Пример:
+    python bench_serialize.py --rows 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database import Base, BookDB, make_engine
+import serialization
+
+
+def paths(book_model):
+    """Способы сериализации: имя -> (запрос, функция от результата запроса)."""
+    adapter = TypeAdapter(List[book_model])
+    orm = select(BookDB).order_by(BookDB.id)
+    rows = select(*BookDB.__table__.columns).order_by(BookDB.id)
+
+    def generic(result):
+        books = adapter.validate_python(result.scalars().all(), from_attributes=True)
+        return json.dumps(jsonable_encoder(books), ensure_ascii=False).encode()
+
+    def pydantic(result):
+        return adapter.dump_json(adapter.validate_python(result.scalars().all(), from_attributes=True))
+
+    def plain(result):
+        keys = list(result.keys())
+        return json.dumps([dict(zip(keys, row)) for row in result.all()], ensure_ascii=False).encode()
+
+    def fast(result):
+        return serialization.rows_json(result.keys(), result.all())
+
+    variants = {
+        "response_model + jsonable_encoder": (orm, generic),
+        "TypeAdapter.dump_json": (orm, pydantic),
+        "строки -> json": (rows, plain),
+    }
+    if serialization.orjson is not None:
+        variants["строки -> orjson"] = (rows, fast)
+    return variants
+
+
+async def run(rows, repeat):
+    from main import Book
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = make_engine(f"sqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(BookDB.__table__.insert(), [
+            {"title": f"Книга {i}", "author": f"Автор {i % 1000}", "year": 1800 + i % 200,
+             "isbn": f"{9780000000000 + i}"} for i in range(rows)])
+    Session = async_sessionmaker(engine)
+
+    print(f"{'способ':>36} {'всего, мс':>10} {'после выборки, мс':>18} {'размер, КБ':>11}")
+    for name, (query, serialize) in paths(Book).items():
+        total = encode = float("inf")
+        for _ in range(repeat):
+            async with Session() as db:
+                start = time.perf_counter()
+                result = await db.execute(query.limit(rows))
+                fetched = time.perf_counter()
+                body = serialize(result)
+                end = time.perf_counter()
+            total = min(total, end - start)
+            encode = min(encode, end - fetched)
+        print(f"{name:>36} {total * 1000:10.1f} {encode * 1000:18.1f} {len(body) / 1024:11.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Микробенчмарк сериализации страницы книг")
+    parser.add_argument("--rows", type=int, default=10000, help="число книг на странице")
+    parser.add_argument("--repeat", type=int, default=20, help="число повторов; берётся лучшее время")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
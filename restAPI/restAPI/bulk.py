@@ -0,0 +1,245 @@
+"""
+Массовая загрузка и выгрузка книг.
+Входные данные (JSON-массив, NDJSON или CSV) читаются из тела запроса
+потоком, проверяются моделью Book пачками по BULK_CHUNK и записываются
+пакетными INSERT (executemany) в одной транзакции.
+Потоком разбираются только NDJSON и CSV; JSON-массив читается целиком,
+поэтому его размер ограничен MAX_JSON_BODY, а большие загрузки следует
+отправлять в NDJSON.
+"""
+import csv
+import io
+import json
+import os
+from collections import Counter
+from typing import List
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+
+from database import BookDB, SessionLocal
+from serialization import dumps
+from stats import UPSERT, apply_stats, century_of, rebuild_stats
+
+# Сколько записей проверяется и вставляется за раз
+BULK_CHUNK = 5000
+# Сколько строк читается из курсора за раз при потоковой выдаче
+STREAM_BATCH = 1000
+# После стольких ошибок проверка прекращается
+MAX_ERRORS = 100
+# Наибольший размер тела с JSON-массивом в байтах
+MAX_JSON_BODY = int(os.getenv("BULK_MAX_JSON_BYTES", 16 * 2**20))
+
+COLUMNS = ["id", "title", "author", "year", "isbn"]
+# Поля, которые записываются при загрузке (id назначает база)
+FIELDS = COLUMNS[1:]
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class BulkValidationError(Exception):
+    """Входные данные не прошли проверку; errors - список ошибок с номерами записей."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} ошибок в данных")
+        self.errors = errors
+
+
+class BulkFormatError(ValueError):
+    """Тело запроса не разбирается в заявленном формате (JSON, NDJSON, CSV)."""
+
+
+class BulkBodyTooLarge(Exception):
+    """JSON-массив в теле запроса больше MAX_JSON_BODY."""
+
+    def __init__(self, limit):
+        super().__init__(f"JSON-массив больше {limit} байт; для больших загрузок используйте NDJSON "
+                         f"({MEDIA_TYPES['ndjson']})")
+
+
+def decode_line(line, number, fmt):
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise BulkFormatError(f"Строка {number} {fmt} не в кодировке UTF-8 (байт {exc.start + 1})") from exc
+
+
+async def request_lines(request, fmt):
+    """Строки тела запроса по мере получения, без чтения всего тела в память; нумерация с 1."""
+    tail = b""
+    number = 0
+    async for chunk in request.stream():
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            number += 1
+            yield number, decode_line(line, number, fmt)
+    if tail:
+        yield number + 1, decode_line(tail, number + 1, fmt)
+
+
+async def read_body(request, limit):
+    """Тело запроса целиком, но не больше limit байт."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise BulkBodyTooLarge(limit)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise BulkBodyTooLarge(limit)
+    return bytes(body)
+
+
+async def read_records(request):
+    """
+    Записи из тела запроса в виде словарей; формат - по заголовку Content-Type.
+    В CSV первая строка - заголовок с именами полей; поля с переводом строки не поддерживаются.
+    Если тело не разбирается, выбрасывается BulkFormatError с номером строки.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == MEDIA_TYPES["json"]:
+        try:
+            records = json.loads(await read_body(request, MAX_JSON_BODY))
+        except UnicodeDecodeError as exc:
+            raise BulkFormatError(f"Тело запроса не в кодировке UTF-8 (байт {exc.start + 1})") from exc
+        except json.JSONDecodeError as exc:
+            raise BulkFormatError(f"Некорректный JSON в теле запроса: {exc.msg} "
+                                  f"(строка {exc.lineno}, позиция {exc.colno})") from exc
+        if not isinstance(records, list):
+            raise BulkValidationError([{"row": None, "msg": "Ожидается JSON-массив книг"}])
+        for record in records:
+            yield record
+    elif content_type == MEDIA_TYPES["ndjson"]:
+        async for number, line in request_lines(request, "NDJSON"):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise BulkFormatError(f"Некорректный JSON в строке {number} NDJSON: {exc.msg} "
+                                      f"(позиция {exc.colno})") from exc
+    elif content_type == MEDIA_TYPES["csv"]:
+        header = None
+        async for number, line in request_lines(request, "CSV"):
+            if not line.strip():
+                continue
+            try:
+                row = next(csv.reader([line], strict=True))
+            except csv.Error as exc:
+                raise BulkFormatError(f"Некорректная строка {number} CSV: {exc}") from exc
+            if header is None:
+                header = row
+                continue
+            # Пустая ячейка в CSV означает отсутствие значения
+            yield {name: value or None for name, value in zip(header, row)}
+    else:
+        raise BulkValidationError([{"row": None, "msg": f"Неподдерживаемый формат: {content_type}"}])
+
+
+async def import_books(db, records, model, mode="insert", chunk=BULK_CHUNK):
+    """
+    Записать книги из асинхронного итератора `records` в базу.
+    - **model**: Pydantic-модель для проверки записей (Book)
+    - **mode**: 'insert' - только добавление, 'upsert' - книги с существующим ISBN обновляются
+    Транзакцию фиксирует вызывающий код; при ошибках проверки
+    выбрасывается BulkValidationError, и ничего не должно быть зафиксировано.
+    Возвращает число записанных книг.
+    """
+    adapter = TypeAdapter(List[model])
+    table = BookDB.__table__
+    if mode == "upsert":
+        stmt = UPSERT[db.bind.dialect.name](table)
+        stmt = stmt.on_conflict_do_update(index_elements=["isbn"], set_={
+            name: stmt.excluded[name] for name in ("title", "author", "year")})
+    else:
+        stmt = table.insert()
+
+    connection = await db.connection()
+    compiled = stmt.compile(dialect=connection.dialect, column_keys=FIELDS)
+    sql, positional = compiled.string, compiled.positional
+    order = compiled.positiontup if positional else FIELDS
+
+    errors = []
+    authors, centuries = Counter(), Counter()
+    total = 0
+
+    async def flush(batch, offset):
+        try:
+            books = adapter.validate_python(batch)
+        except ValidationError as exc:
+            for error in exc.errors(include_url=False, include_input=False):
+                errors.append({"row": offset + error["loc"][0], "field": error["loc"][-1], "msg": error["msg"]})
+            return
+        if errors:
+            return
+        # Параметры передаются драйверу напрямую (executemany), минуя построение
+        # словарей параметров SQLAlchemy для каждой строки
+        rows = [tuple(getattr(book, name) for name in order) for book in books]
+        await connection.exec_driver_sql(sql, rows if positional else [dict(zip(order, row)) for row in rows])
+        authors.update(book.author for book in books)
+        centuries.update(century_of(book.year) for book in books)
+
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) == chunk:
+            await flush(batch, total)
+            total += len(batch)
+            batch = []
+            if len(errors) >= MAX_ERRORS:
+                break
+    if batch and len(errors) < MAX_ERRORS:
+        await flush(batch, total)
+        total += len(batch)
+
+    if errors:
+        raise BulkValidationError(errors[:MAX_ERRORS])
+    # При обновлении старые значения неизвестны, поэтому сводки пересчитываются целиком
+    if mode == "upsert":
+        await db.run_sync(lambda session: rebuild_stats(session.connection()))
+    else:
+        await db.run_sync(lambda session: apply_stats(session.connection(), authors, centuries))
+    return total
+
+
+def format_rows(rows, fmt, first):
+    """Пачка строк выгрузки в формате fmt; first - это первая пачка."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if first:
+            writer.writerow(COLUMNS)
+        writer.writerows(rows)
+        return buffer.getvalue()
+    lines = [dumps(row._asdict()) for row in rows]
+    if fmt == "json":
+        return (b"[" if first else b",") + b",".join(lines)
+    return b"".join(line + b"\n" for line in lines)
+
+
+async def export_books(fmt="ndjson", after=0, limit=None):
+    """
+    Генератор выгрузки книг в формате 'ndjson', 'csv' или 'json'.
+    Строки читаются из курсора базы пачками по STREAM_BATCH без создания
+    ORM-объектов, поэтому расход памяти не зависит от размера таблицы.
+    Сессия открывается здесь же: она должна жить, пока ответ отдаётся клиенту.
+    """
+    query = select(BookDB.id, BookDB.title, BookDB.author, BookDB.year, BookDB.isbn) \
+        .where(BookDB.id > after).order_by(BookDB.id)
+    if limit is not None:
+        query = query.limit(limit)
+    first = True
+    async with SessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=STREAM_BATCH))
+        async for rows in result.partitions():
+            yield format_rows(rows, fmt, first)
+            first = False
+    if fmt == "json":
+        yield b"[]" if first else b"]"
+    elif fmt == "csv" and first:
+        yield format_rows([], fmt, first)
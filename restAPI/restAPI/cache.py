@@ -0,0 +1,180 @@
+"""
+Кэш ответов на чтение книг.
+Готовый ответ (тело, ETag, время изменения) хранится по ключу маршрута
+и параметров. Повторный запрос отдаётся из кэша без обращения к базе,
+а запрос с If-None-Match / If-Modified-Since получает 304.
+Ключи включают номер поколения данных: любая запись в базу увеличивает
+его, и все прежние ответы становятся недействительными. Вместе с номером
+хранится время последней записи - оно и отдаётся в Last-Modified.
+
+По умолчанию используется кэш в памяти процесса (LRU с TTL); при
+заданной переменной CACHE_URL=redis://... - общий кэш в Redis для всех
+процессов приложения.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Response
+
+# Число ответов в кэше процесса и время их жизни в секундах
+CACHE_SIZE = 1024
+CACHE_TTL = 60
+
+GENERATION_KEY = "books:generation"
+MODIFIED_KEY = "books:modified"
+
+
+class MemoryCache:
+    """LRU-кэш в памяти процесса с ограничением времени жизни записей."""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        # Счётчики не вытесняются и не устаревают, в отличие от записей
+        self.counters = {}
+
+    async def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    async def counter(self, key):
+        return self.counters.get(key, 0)
+
+    async def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    async def get_time(self, key):
+        return self.counters.get(key)
+
+    async def set_time(self, key, value, replace=True):
+        if replace or key not in self.counters:
+            self.counters[key] = value
+
+
+class RedisCache:
+    """Общий кэш в Redis; требует установленного пакета redis."""
+
+    def __init__(self, url, ttl=CACHE_TTL):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("Для кэша в Redis установите пакет redis") from exc
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, key):
+        value = await self.client.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key, value):
+        await self.client.set(key, json.dumps(value), ex=self.ttl)
+
+    async def counter(self, key):
+        return int(await self.client.get(key) or 0)
+
+    async def incr(self, key):
+        return await self.client.incr(key)
+
+    async def get_time(self, key):
+        value = await self.client.get(key)
+        return None if value is None else float(value)
+
+    async def set_time(self, key, value, replace=True):
+        await self.client.set(key, value, nx=not replace)
+
+
+def create_cache(url=None):
+    """Выбрать хранилище кэша по адресу: redis://... или кэш в памяти процесса."""
+    if url and url.startswith(("redis://", "rediss://")):
+        return RedisCache(url)
+    return MemoryCache()
+
+
+cache = create_cache(os.getenv("CACHE_URL"))
+
+
+async def invalidate():
+    """Сбросить все закэшированные ответы (вызывается после каждой записи в базу)."""
+    # Время записывается до смены поколения: читатель между двумя шагами
+    # получит более позднее Last-Modified, но никогда не устаревшее
+    await cache.set_time(MODIFIED_KEY, time.time())
+    await cache.incr(GENERATION_KEY)
+
+
+async def last_modified():
+    """Время последней записи в базу; до первой записи - время первого обращения к кэшу."""
+    modified = await cache.get_time(MODIFIED_KEY)
+    if modified is None:
+        # Первым записанным значением пользуются все процессы
+        await cache.set_time(MODIFIED_KEY, time.time(), replace=False)
+        modified = await cache.get_time(MODIFIED_KEY)
+    return modified
+
+
+def not_modified(request, entry):
+    """Проверить условные заголовки запроса: If-None-Match важнее If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry["etag"] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(entry["last_modified"]) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def cached_response(request, key, build):
+    """
+    Ответ для GET-запроса с кэшированием.
+    - **key**: ключ ответа (маршрут и параметры)
+    - **build**: корутина без аргументов, возвращающая (тело в байтах, заголовки)
+    При попадании в кэш база данных не используется.
+    Last-Modified - время записи, после которой данные последний раз менялись,
+    а не время заполнения кэша: повторное заполнение его не сдвигает.
+    """
+    # Поколение читается раньше времени: invalidate меняет их в обратном порядке
+    key = f"{key}:{await cache.counter(GENERATION_KEY)}"
+    modified = await last_modified()
+    entry = await cache.get(key)
+    if entry is None:
+        body, headers = await build()
+        entry = {
+            "body": body.decode("utf-8"),
+            "headers": headers,
+            "etag": '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"',
+            "last_modified": modified,
+        }
+        await cache.set(key, entry)
+
+    headers = {
+        **entry["headers"],
+        "ETag": entry["etag"],
+        "Last-Modified": formatdate(entry["last_modified"], usegmt=True),
+        # Клиент может хранить ответ, но должен проверять его актуальность
+        "Cache-Control": "no-cache",
+    }
+    if not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(entry["body"], media_type="application/json", headers=headers)
@@ -0,0 +1,69 @@
+"""
+Нагрузочный тест Books API.
+Отправляет запросы к запущенному серверу с заданным числом одновременных
+клиентов и выводит пропускную способность и задержки.
+
+Пример:
+    uvicorn main:app --port 8000
+    python load_test.py --url http://127.0.0.1:8000 --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client, paths, latencies, errors):
+    """Один клиент: по очереди выполняет запросы из общего списка путей."""
+    while paths:
+        path = paths.pop()
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(url, total, concurrency, limit, max_id):
+    """Выполнить `total` запросов страниц книг в `concurrency` потоков."""
+    paths = [f"/api/books?limit={limit}&after={random.randint(0, max_id)}" for _ in range(total)]
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, paths, latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": len(errors),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест GET /api/books")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=2000, help="общее число запросов")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50],
+                        help="число одновременных клиентов (можно несколько значений)")
+    parser.add_argument("--limit", type=int, default=100, help="размер страницы")
+    parser.add_argument("--max-id", type=int, default=1000, help="верхняя граница случайного курсора after")
+    args = parser.parse_args()
+
+    print(f"{'клиенты':>8} {'запросов/с':>11} {'p50, мс':>9} {'p95, мс':>9} {'ошибки':>7}")
+    for concurrency in args.concurrency:
+        stats = asyncio.run(run(args.url, args.requests, concurrency, args.limit, args.max_id))
+        print(f"{concurrency:>8} {stats['rps']:11.1f} {stats['p50_ms']:9.1f} "
+              f"{stats['p95_ms']:9.1f} {stats['errors']:>7}")
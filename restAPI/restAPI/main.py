@@ -1,18 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
-from collections import Counter
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from database import get_db, BookDB
-from auth import verify_api_key
+from fastapi import Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, init_db, BookDB
+from stats import init_stats, read_stats
+from bulk import (MEDIA_TYPES, BulkBodyTooLarge, BulkFormatError, BulkValidationError, export_books,
+                  import_books, read_records)
+from search import init_search, search_books, search_supported
+from cache import cached_response, invalidate
+from serialization import FAST_JSON, rows_json
+from auth import init_keys, verify_api_key
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Таблицы создаются при запуске, до приёма запросов
+    await init_db()
+    await init_stats()
+    await init_search()
+    await init_keys()
+    yield
+
 
 # Создание экземпляра приложения FastAPI
 app = FastAPI(
 title="Books API",
 description="REST API для управления библиотекой книг",
-version="1.0.0"
+version="1.0.0",
+lifespan=lifespan
 )
 
 # Модель данных для книги (Pydantic схема)
@@ -41,15 +62,12 @@ class BookUpdate(BaseModel):
     year: Optional[int] = Field(None, ge=1000, le=datetime.now().year)
     isbn: Optional[str] = Field(None, min_length=10, max_length=13)
 
-# Временное хранилище данных (в реальном приложении используется база данных)
-books_db: List[Book] = [
-    Book(id=1, title="Война и мир", author="Лев Толстой", year=1869, isbn="9785170987654"),
-    Book(id=2, title="Преступление и наказание", author="Федор Достоевский", year=1866, isbn="9785170876543"),
-    Book(id=3, title="Евгений Онегин", author="Александр Пушкин", year=1833, isbn="9785170765432")
-]
+# Сериализация списка книг для кэшируемых ответов
+book_list = TypeAdapter(List[Book])
 
-# Счетчик для генерации ID
-next_id = 4
+# Размер страницы списка книг по умолчанию и максимальный
+PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
 
 
 # Корневой эндпоинт
@@ -66,48 +84,174 @@ async def root():
     }
 
 
-# GET /api/books - Получение списка всех книг
+# GET /api/books - Получение списка книг (постранично)
 @app.get("/api/books", response_model=List[Book], tags=["Books"])
-async def get_books(db: Session = Depends(get_db)):
-    """Получить список всех книг из базы данных."""
+async def get_books(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT, description="Размер страницы"),
+    after: int = Query(0, ge=0, description="ID последней книги предыдущей страницы"),
+    stream: bool = Query(False, description="Отдать книги потоком в формате NDJSON"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Получить список книг из базы данных.
+    - **limit**: число книг на странице (по умолчанию PAGE_LIMIT)
+    - **after**: вернуть книги с ID больше указанного (курсор страницы)
+    - **stream**: отдать книги потоком NDJSON; без limit - все книги после after
+    Книги упорядочены по ID. ID последней книги страницы возвращается
+    в заголовке X-Next-After; если заголовка нет, страница последняя.
+    Страницы кэшируются и поддерживают условные запросы (ETag, 304).
+    """
+    if stream:
+        return StreamingResponse(export_books("ndjson", after, limit), media_type=MEDIA_TYPES["ndjson"])
+
+    limit = limit or PAGE_LIMIT
+
+    async def build():
+        if FAST_JSON:
+            # Строки базы сразу в JSON, без ORM-объектов и повторной проверки моделью
+            result = await db.execute(select(*BookDB.__table__.columns).where(BookDB.id > after)
+                                      .order_by(BookDB.id).limit(limit))
+            books = result.all()
+            body = rows_json(result.keys(), books)
+        else:
+            books = (await db.scalars(select(BookDB).where(BookDB.id > after).order_by(BookDB.id).limit(limit))).all()
+            body = book_list.dump_json(book_list.validate_python(books, from_attributes=True))
+        headers = {"X-Next-After": str(books[-1].id)} if len(books) == limit else {}
+        return body, headers
 
-    books = db.query(BookDB).all()
+    return await cached_response(request, f"books:{after}:{limit}", build)
 
-    return books
+
+# POST /api/books/bulk - Массовая загрузка книг
+@app.post("/api/books/bulk", status_code=status.HTTP_201_CREATED, tags=["Books"])
+async def bulk_import(
+    request: Request,
+    mode: str = Query("insert", pattern="^(insert|upsert)$", description="insert или upsert (по ISBN)"),
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_api_key),
+):
+    """
+    Загрузить много книг одним запросом.
+    Тело - JSON-массив (application/json), NDJSON (application/x-ndjson)
+    или CSV с заголовком (text/csv). Все книги записываются в одной транзакции:
+    при ошибке в любой записи не сохраняется ничего.
+    NDJSON и CSV читаются потоком; JSON-массив - целиком и не больше
+    BULK_MAX_JSON_BYTES байт (по умолчанию 16 МиБ), иначе возвращается 413.
+    - **mode**: insert - только новые книги; upsert - книги с существующим ISBN обновляются
+    """
+    try:
+        imported = await import_books(db, read_records(request), Book, mode)
+        await db.commit()
+    except BulkValidationError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=exc.errors)
+    except BulkFormatError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except BulkBodyTooLarge as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(exc))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="Книги с такими ISBN уже существуют; используйте mode=upsert")
+    await invalidate()
+    return {"imported": imported}
+
+
+# GET /api/books/export - Выгрузка всех книг
+@app.get("/api/books/export", tags=["Books"])
+async def bulk_export(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|json)$")):
+    """
+    Выгрузить все книги потоком.
+    - **format**: ndjson, csv или json
+    """
+    return StreamingResponse(export_books(fmt), media_type=MEDIA_TYPES[fmt])
+
+
+# GET /api/books/search - Поиск книг
+@app.get("/api/books/search", tags=["Books"])
+async def search(
+    q: str = Query(..., min_length=1, description="Слова из названия или имени автора (поиск по началу слова)"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_LIMIT, description="Размер страницы"),
+    offset: int = Query(0, ge=0, description="Сколько результатов пропустить"),
+    author: Optional[str] = Query(None, description="Только книги этого автора"),
+    year: Optional[int] = Query(None, description="Только книги этого года"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Полнотекстовый поиск по названию и автору.
+    Возвращает страницу результатов по убыванию релевантности (score - оценка bm25,
+    чем меньше, тем лучше), общее число совпадений и фасеты: число найденных книг
+    по авторам и годам.
+    """
+    if not search_supported(db.bind.dialect):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Полнотекстовый поиск доступен только для SQLite"
+        )
+    return await search_books(db, q, limit, offset, author, year)
+
+
+async def find_book(db, book_id):
+    """Найти книгу по первичному ключу или вернуть ошибку 404."""
+    book = await db.get(BookDB, book_id)
+    if book is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Книга с ID {book_id} не найдена"
+        )
+    return book
+
+
+async def commit_book(db, book):
+    """
+    Сохранить изменения книги.
+    Если ISBN уже есть у другой книги, возвращается ошибка 409.
+    """
+    # После отката атрибуты объекта сбрасываются, поэтому ISBN запоминаем заранее
+    isbn = book.isbn
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Книга с ISBN {isbn} уже существует"
+        )
+    await invalidate()
+    return book
 
 
 # GET /api/books/{book_id} - Получение книги по ID
 @app.get("/api/books/{book_id}", response_model=Book, tags=["Books"])
-async def get_book(book_id: int):
+async def get_book(book_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """
     Получить книгу по ID.
     - **book_id**: ID книги (целое число)
     Возвращает информацию о книге с указанным ID.
     Если книга не найдена, возвращается ошибка 404.
     """
-    for book in books_db:
-        if book.id == book_id:
-            return book
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"Книга с ID {book_id} не найдена"
-    )
+    async def build():
+        book = Book.model_validate(await find_book(db, book_id), from_attributes=True)
+        return book.model_dump_json().encode(), {}
+
+    return await cached_response(request, f"book:{book_id}", build)
 
 
 # POST /api/books - Создание новой книги
 @app.post("/api/books", response_model=Book, status_code=status.HTTP_201_CREATED, tags=["Books"])
-async def create_book(book: Book, db: Session = Depends(get_db), api_key: str = Depends(verify_api_key)):
+async def create_book(book: Book, db: AsyncSession = Depends(get_db), api_key: str = Depends(verify_api_key)):
     """Создать новую книгу в базе данных."""
     db_book = BookDB(**book.model_dump(exclude={"id"}))
     db.add(db_book)
-    db.commit()
-    db.refresh(db_book)
-    return db_book
+    return await commit_book(db, db_book)
 
 
 # PUT /api/books/{book_id} - Полное обновление книги
 @app.put("/api/books/{book_id}", response_model=Book, tags=["Books"])
-async def update_book(book_id: int, updated_book: Book):
+async def update_book(book_id: int, updated_book: Book, db: AsyncSession = Depends(get_db)):
     """
     Полностью обновить информацию о книге.
     - **book_id**: ID книги для обновления
@@ -115,21 +259,16 @@ async def update_book(book_id: int, updated_book: Book):
     Заменяет все данные книги новыми значениями.
     Если книга не найдена, возвращается ошибка 404.
     """
-    for index, book in enumerate(books_db):
-        if book.id == book_id:
-            # Сохраняем ID
-            updated_book.id = book_id
-            books_db[index] = updated_book
-            return updated_book
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"Книга с ID {book_id} не найдена"
-    )
+    book = await find_book(db, book_id)
+    # ID сохраняется, остальные поля заменяются целиком
+    for field, value in updated_book.model_dump(exclude={"id"}).items():
+        setattr(book, field, value)
+    return await commit_book(db, book)
 
 
 # PATCH /api/books/{book_id} - Частичное обновление книги
 @app.patch("/api/books/{book_id}", response_model=Book, tags=["Books"])
-async def partial_update_book(book_id: int, book_update: BookUpdate):
+async def partial_update_book(book_id: int, book_update: BookUpdate, db: AsyncSession = Depends(get_db)):
     """
     Частично обновить информацию о книге.
     - **book_id**: ID книги для обновления
@@ -137,52 +276,35 @@ async def partial_update_book(book_id: int, book_update: BookUpdate):
     Обновляет только те поля, которые были переданы в запросе.
     Если книга не найдена, возвращается ошибка 404.
     """
-    for book in books_db:
-        if book.id == book_id:
-            # Обновляем только переданные поля
-            update_data = book_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(book, field, value)
-            return book
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"Книга с ID {book_id} не найдена"
-    )
+    book = await find_book(db, book_id)
+    # Обновляем только переданные поля
+    for field, value in book_update.model_dump(exclude_unset=True).items():
+        setattr(book, field, value)
+    return await commit_book(db, book)
 
 
 # DELETE /api/books/{book_id} - Удаление книги
 @app.delete("/api/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Books"])
-async def delete_book(book_id: int):
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_db)):
     """
     Удалить книгу по ID.
     - **book_id**: ID книги для удаления
     Удаляет книгу из системы.
     Если книга не найдена, возвращается ошибка 404.
     """
-    for index, book in enumerate(books_db):
-        if book.id == book_id:
-            books_db.pop(index)
-            return
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail=f"Книга с ID {book_id} не найдена"
-    )
+    book = await find_book(db, book_id)
+    await db.delete(book)
+    await db.commit()
+    await invalidate()
 
 
 @app.get("/api/book/stats", tags=["Statistics"])
-async def get_statistics():
+async def get_statistics(db: AsyncSession = Depends(get_db)):
     """
     Получить статистику по книгам.
     Возвращает общее количество книг, распределение по авторам и векам.
     """
-    total_books = len(books_db)
-    authors = Counter(book.author for book in books_db)
-    centuries = Counter(book.year // 100 + 1 for book in books_db)
-    return {
-        "total_books": total_books,
-        "books_by_author": dict(authors),
-        "books_by_century": {f"{century} век": count for century, count in centuries.items()}
-    }
+    return await read_stats(db)
 
 
 if __name__ == "__main__":
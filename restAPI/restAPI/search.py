@@ -0,0 +1,98 @@
+"""
+Полнотекстовый поиск книг по названию и автору.
+Используется виртуальная таблица SQLite FTS5 с внешним содержимым
+(content='books'): индекс хранит только токены, а триггеры обновляют
+его при каждом изменении таблицы books, в том числе при массовой загрузке.
+"""
+import re
+
+from sqlalchemy import text
+
+from database import engine
+
+# Сколько значений каждой фасеты возвращается
+FACET_LIMIT = 10
+
+SCHEMA = [
+    # Префиксные индексы на 2 и 3 символа ускоряют поиск по началу слова
+    """CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author) VALUES ('delete', old.id, old.title, old.author);
+        INSERT INTO books_fts(rowid, title, author) VALUES (new.id, new.title, new.author);
+    END""",
+]
+
+
+def search_supported(dialect):
+    return dialect.name == "sqlite"
+
+
+def create_search_index(conn):
+    """Создать индекс FTS5 и триггеры; при первом создании индекс заполняется по таблице books."""
+    if not search_supported(conn.dialect):
+        return
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'books_fts'").first()
+    for statement in SCHEMA:
+        conn.exec_driver_sql(statement)
+    if not exists:
+        conn.exec_driver_sql("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+async def init_search():
+    async with engine.begin() as conn:
+        await conn.run_sync(create_search_index)
+
+
+def match_query(q):
+    """
+    Запрос пользователя в синтаксис MATCH: каждое слово ищется по префиксу,
+    все слова должны встретиться. Кавычки и операторы FTS5 экранируются.
+    """
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+async def search_books(db, q, limit, offset, author=None, year=None):
+    """
+    Найти книги по словам из q в названии и авторе.
+    Результаты упорядочены по релевантности (bm25, совпадение в названии весит больше).
+    - **author**, **year**: уточняющие фильтры (значения фасет)
+    Возвращает найденные книги страницы, общее число совпадений и фасеты по автору и году.
+    """
+    match = match_query(q)
+    if not match:
+        return {"total": 0, "items": [], "facets": {"author": {}, "year": {}}}
+
+    where = ["books_fts MATCH :match"]
+    params = {"match": match}
+    if author is not None:
+        where.append("books.author = :author")
+        params["author"] = author
+    if year is not None:
+        where.append("books.year = :year")
+        params["year"] = year
+    source = f"FROM books_fts JOIN books ON books.id = books_fts.rowid WHERE {' AND '.join(where)}"
+
+    rows = await db.execute(text(
+        f"SELECT books.id, books.title, books.author, books.year, books.isbn, "
+        f"bm25(books_fts, 10.0, 5.0) AS score {source} ORDER BY score LIMIT :limit OFFSET :offset"),
+        {**params, "limit": limit, "offset": offset})
+    items = [row._asdict() for row in rows]
+    total = (await db.execute(text(f"SELECT count(*) {source}"), params)).scalar()
+
+    facets = {}
+    for name in ("author", "year"):
+        counts = await db.execute(text(
+            f"SELECT books.{name}, count(*) AS n {source} GROUP BY books.{name} "
+            f"ORDER BY n DESC, books.{name} LIMIT :facets"), {**params, "facets": FACET_LIMIT})
+        facets[name] = {value: n for value, n in counts}
+    return {"total": total, "items": items, "facets": facets}
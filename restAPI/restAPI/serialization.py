@@ -0,0 +1,31 @@
+"""
+Быстрая сериализация строк базы в JSON.
+Строки, прочитанные из таблицы books, уже прошли проверку моделью Book
+при записи, поэтому их можно превращать в JSON напрямую, без создания
+ORM-объектов и повторной проверки Pydantic. Если установлен orjson,
+используется он; иначе - стандартный json.
+
+Быстрый путь для списков книг включается переменной окружения FAST_JSON=1.
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FAST_JSON = os.getenv("FAST_JSON") == "1"
+
+
+def dumps(value):
+    """Значение в JSON (bytes, UTF-8, без лишних пробелов)."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def rows_json(keys, rows):
+    """JSON-массив объектов из строк результата запроса; keys - имена столбцов."""
+    keys = list(keys)
+    return dumps([dict(zip(keys, row)) for row in rows])
@@ -0,0 +1,105 @@
+from collections import Counter
+
+from sqlalchemy import Column, Integer, String, delete, event, func, inspect, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import Base, BookDB, engine
+
+# INSERT ... ON CONFLICT DO UPDATE для поддерживаемых СУБД
+UPSERT = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+# Сводные таблицы статистики: число книг по автору и по веку
+class AuthorStats(Base):
+    __tablename__ = "author_stats"
+    author = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+class CenturyStats(Base):
+    __tablename__ = "century_stats"
+    century = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+def century_of(year):
+    return year // 100 + 1
+
+
+@event.listens_for(Session, "before_flush")
+def update_stats(session, flush_context, instances):
+    """
+    Обновить сводные таблицы в той же транзакции, что и изменения книг.
+    Для каждой добавленной, удалённой или изменённой книги считается
+    приращение по автору и веку; в базу уходит одно UPSERT на ключ.
+    """
+    authors, centuries = Counter(), Counter()
+    for book in session.new:
+        if isinstance(book, BookDB):
+            authors[book.author] += 1
+            centuries[century_of(book.year)] += 1
+    for book in session.deleted:
+        if isinstance(book, BookDB):
+            authors[book.author] -= 1
+            centuries[century_of(book.year)] -= 1
+    for book in session.dirty:
+        if not isinstance(book, BookDB):
+            continue
+        state = inspect(book)
+        for name, counter, key in (("author", authors, str), ("year", centuries, century_of)):
+            history = state.attrs[name].history
+            if history.deleted and history.added:
+                counter[key(history.deleted[0])] -= 1
+                counter[key(history.added[0])] += 1
+
+    apply_stats(session.connection(), authors, centuries)
+
+
+def apply_stats(connection, authors, centuries):
+    """Прибавить к сводным таблицам приращения по авторам и векам (Counter ключ -> дельта)."""
+    upsert = UPSERT[connection.dialect.name]
+    for model, column, counter in ((AuthorStats, "author", authors), (CenturyStats, "century", centuries)):
+        changes = [{column: key, "count": delta} for key, delta in counter.items() if delta]
+        if not changes:
+            continue
+        stmt = upsert(model)
+        stmt = stmt.on_conflict_do_update(index_elements=[column],
+                                          set_={"count": model.count + stmt.excluded.count})
+        connection.execute(stmt, changes)
+        connection.execute(delete(model).where(model.count <= 0))
+
+
+def rebuild_stats(conn):
+    """Пересчитать сводные таблицы по книгам агрегатами GROUP BY."""
+    century = (BookDB.year // 100 + 1).label("century")
+    conn.execute(delete(AuthorStats))
+    conn.execute(delete(CenturyStats))
+    conn.execute(insert(AuthorStats).from_select(
+        ["author", "count"], select(BookDB.author, func.count()).group_by(BookDB.author)))
+    conn.execute(insert(CenturyStats).from_select(
+        ["century", "count"], select(century, func.count()).group_by(century)))
+
+
+async def init_stats():
+    """
+    Заполнить сводные таблицы заново при запуске приложения:
+    так учитываются изменения, сделанные в обход API.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_stats)
+
+
+async def read_stats(db):
+    """Статистика из сводных таблиц: время зависит от числа авторов и веков, а не книг."""
+    authors = (await db.execute(select(AuthorStats.author, AuthorStats.count))).all()
+    centuries = (await db.execute(select(CenturyStats.century, CenturyStats.count)
+                                  .order_by(CenturyStats.century))).all()
+    return {
+        "total_books": sum(count for _, count in authors),
+        "books_by_author": dict(authors),
+        "books_by_century": {f"{century} век": count for century, count in centuries}
+    }
@@ -0,0 +1,48 @@
+import os
+import sqlite3
+import sys
+import tempfile
+
+import pytest
+
+# Модули приложения читают настройки при импорте, поэтому тестовая база задаётся заранее
+DB_PATH = os.path.join(tempfile.mkdtemp(), "books.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("CACHE_URL", None)
+os.environ.pop("RATE_LIMIT_URL", None)
+
+# Модули приложения импортируют друг друга без префикса (from database import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "restAPI"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import auth  # noqa: E402
+import cache  # noqa: E402
+import main  # noqa: E402
+from database import engine  # noqa: E402
+
+API_KEY = {"X-API-Key": auth.API_KEY}
+TABLES = ["books", "author_stats", "century_stats", "api_keys"]
+
+
+@pytest.fixture
+def client():
+    """Клиент приложения на пустой базе, с пустым кэшем и полными вёдрами ограничителя."""
+    cache.cache = cache.MemoryCache()
+    auth.limiter = auth.TokenBucket()
+    with TestClient(main.app) as client:
+        yield client
+        # Соединения пула привязаны к циклу событий клиента
+        client.portal.call(engine.dispose)
+    # Триггеры удаляют книги и из полнотекстового индекса
+    with sqlite3.connect(DB_PATH) as conn:
+        for table in TABLES:
+            conn.execute(f"DELETE FROM {table}")
+
+
+def add_books(client, books):
+    """Создать книги одним запросом массовой загрузки (один жетон ограничителя) и вернуть их ID."""
+    response = client.post("/api/books/bulk", json=books, headers=API_KEY)
+    assert response.status_code == 201, response.text
+    exported = client.get("/api/books/export", params={"format": "json"}).json()
+    return [book["id"] for book in exported[len(exported) - len(books):]]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import auth
+from conftest import API_KEY
+
+BOOK = {"title": "Мастер и Маргарита", "author": "Михаил Булгаков", "year": 1967}
+
+
+def create(client, key):
+    return client.post("/api/books", json=BOOK, headers={"X-API-Key": key})
+
+
+@pytest.fixture
+def fresh_keys(monkeypatch):
+    """Кэш ключей перечитывается из базы на каждом запросе."""
+    monkeypatch.setattr(auth.key_store, "refresh", -1)
+
+
+def test_valid_key(client):
+    assert create(client, auth.API_KEY).status_code == 201
+
+
+def test_missing_key(client):
+    response = client.post("/api/books", json=BOOK)
+    assert response.status_code in (401, 403)
+
+
+def test_unknown_key(client):
+    response = create(client, "not-a-key")
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Неверный API ключ"
+
+
+def test_revoked_key(client, fresh_keys):
+    key = client.portal.call(auth.create_key, "reader")
+    assert create(client, key).status_code == 201
+
+    assert client.portal.call(auth.revoke_key, "reader")
+    assert create(client, key).status_code == 403
+    # Отзыв одного ключа не затрагивает остальные
+    assert create(client, auth.API_KEY).status_code == 201
+    assert not client.portal.call(auth.revoke_key, "nobody")
+
+
+def test_rate_limit(client, fresh_keys):
+    key = client.portal.call(auth.create_key, "slow", 0.1, 2)
+    assert [create(client, key).status_code for _ in range(2)] == [201, 201]
+
+    response = create(client, key)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 10
+    assert "slow" in response.json()["detail"]
+    # У каждого ключа своё ведро
+    assert client.post("/api/books", json={**BOOK, "title": "Белая гвардия"}, headers=API_KEY).status_code == 201
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_token_bucket_refills(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(auth, "time", clock)
+    bucket = auth.TokenBucket()
+
+    async def take():
+        return await bucket.take("key", 2.0, 3)
+
+    assert [asyncio.run(take()) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert asyncio.run(take()) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert asyncio.run(take()) == 0.0
+    # Ведро не наполняется сверх burst
+    clock.now += 100
+    assert [asyncio.run(take()) for _ in range(4)][-1] > 0
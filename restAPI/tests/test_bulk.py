@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+
+import pytest
+
+import bulk
+from conftest import API_KEY
+
+BOOKS = [
+    {"title": "Мастер и Маргарита", "author": "Михаил Булгаков", "year": 1967, "isbn": "9785170123456"},
+    {"title": "Белая гвардия", "author": "Михаил Булгаков", "year": 1925, "isbn": None},
+    {"title": "Война и мир", "author": "Лев Толстой", "year": 1869, "isbn": "9785170000001"},
+]
+
+
+def as_ndjson(books):
+    return "".join(json.dumps(book, ensure_ascii=False) + "\n" for book in books).encode()
+
+
+def as_csv(books):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=["title", "author", "year", "isbn"], lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(books)
+    return buffer.getvalue().encode()
+
+
+def as_json(books):
+    return json.dumps(books, ensure_ascii=False).encode()
+
+
+ENCODERS = {"json": as_json, "ndjson": as_ndjson, "csv": as_csv}
+
+
+def upload(client, fmt, body, mode="insert"):
+    return client.post("/api/books/bulk", params={"mode": mode}, content=body,
+                       headers={**API_KEY, "Content-Type": bulk.MEDIA_TYPES[fmt]})
+
+
+def stored(client):
+    return [{key: book[key] for key in BOOKS[0]} for book in client.get("/api/books").json()]
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_import(client, fmt):
+    response = upload(client, fmt, ENCODERS[fmt](BOOKS))
+    assert response.status_code == 201, response.text
+    assert response.json() == {"imported": len(BOOKS)}
+    assert stored(client) == BOOKS
+    stats = client.get("/api/book/stats").json()
+    assert stats["books_by_author"] == {"Михаил Булгаков": 2, "Лев Толстой": 1}
+
+
+def test_import_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK", 2)
+    books = [{"title": f"Книга {i}", "author": "Автор", "year": 2000} for i in range(5)]
+    response = client.post("/api/books/bulk", json=books, headers=API_KEY)
+    assert response.json() == {"imported": 5}
+    assert [book["title"] for book in client.get("/api/books").json()] == [book["title"] for book in books]
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_export(client, fmt):
+    upload(client, "json", as_json(BOOKS))
+    response = client.get("/api/books/export", params={"format": fmt})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(bulk.MEDIA_TYPES[fmt])
+    if fmt == "json":
+        rows = response.json()
+    elif fmt == "ndjson":
+        rows = [json.loads(line) for line in response.text.splitlines()]
+    else:
+        rows = [{**row, "id": int(row["id"]), "year": int(row["year"]), "isbn": row["isbn"] or None}
+                for row in csv.DictReader(io.StringIO(response.text))]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert [{key: row[key] for key in BOOKS[0]} for row in rows] == BOOKS
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_export_empty(client, fmt):
+    response = client.get("/api/books/export", params={"format": fmt})
+    assert response.text == {"json": "[]", "ndjson": "", "csv": "id,title,author,year,isbn\n"}[fmt]
+
+
+def test_upsert_by_isbn(client):
+    upload(client, "json", as_json(BOOKS))
+    changed = [{**BOOKS[0], "title": "Мастер и Маргарита (полная версия)", "author": "М. А. Булгаков"},
+               {"title": "Анна Каренина", "author": "Лев Толстой", "year": 1878, "isbn": "9785170000002"}]
+
+    response = upload(client, "json", as_json(changed))
+    assert response.status_code == 409
+    assert len(stored(client)) == len(BOOKS)
+
+    response = upload(client, "json", as_json(changed), mode="upsert")
+    assert response.status_code == 201
+    books = stored(client)
+    assert len(books) == len(BOOKS) + 1
+    assert books[0] == changed[0]
+    assert books[-1] == changed[1]
+    stats = client.get("/api/book/stats").json()
+    assert stats["books_by_author"] == {"Михаил Булгаков": 1, "М. А. Булгаков": 1, "Лев Толстой": 2}
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_validation_errors(client, fmt):
+    books = [BOOKS[0], {**BOOKS[1], "year": 999}, BOOKS[2], {**BOOKS[1], "title": ""}]
+    response = upload(client, fmt, ENCODERS[fmt](books))
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [(error["row"], error["field"]) for error in errors] == [(1, "year"), (3, "title")]
+    # Транзакция откатывается целиком, включая корректные записи
+    assert stored(client) == []
+    assert client.get("/api/book/stats").json()["total_books"] == 0
+
+
+def test_validation_errors_across_chunks(client, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK", 2)
+    books = [BOOKS[1]] * 3 + [{**BOOKS[1], "author": ""}]
+    response = client.post("/api/books/bulk", json=books, headers=API_KEY)
+    assert response.status_code == 422
+    assert [error["row"] for error in response.json()["detail"]] == [3]
+    assert stored(client) == []
+
+
+@pytest.mark.parametrize("fmt, body, message", [
+    ("json", b'[{"title": "x",', "Некорректный JSON в теле запроса"),
+    ("json", '[{"title": "Идиот"}]'.encode("cp1251"), "не в кодировке UTF-8"),
+    ("ndjson", as_ndjson(BOOKS[:1]) + b'{"title": \n', "Некорректный JSON в строке 2 NDJSON"),
+    ("ndjson", as_ndjson(BOOKS[:1]) + '{"title": "Идиот"}\n'.encode("cp1251"), "Строка 2 NDJSON не в кодировке UTF-8"),
+    ("csv", as_csv(BOOKS[:1]) + b'"x"y,a,2000,\n', "Некорректная строка 3 CSV"),
+    ("csv", as_csv(BOOKS[:1]) + "Идиот,Достоевский,1869,\n".encode("cp1251"), "Строка 3 CSV не в кодировке UTF-8"),
+])
+def test_format_errors(client, fmt, body, message):
+    response = upload(client, fmt, body)
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
+    assert stored(client) == []
+
+
+def test_json_body_limit(client, monkeypatch):
+    body = as_json(BOOKS)
+    monkeypatch.setattr(bulk, "MAX_JSON_BODY", len(body) - 1)
+    response = upload(client, "json", body)
+    assert response.status_code == 413
+    assert bulk.MEDIA_TYPES["ndjson"] in response.json()["detail"]
+    # NDJSON читается потоком и не ограничен
+    assert upload(client, "ndjson", as_ndjson(BOOKS)).status_code == 201
+
+
+def test_bad_request_shape(client):
+    response = client.post("/api/books/bulk", json={"books": BOOKS}, headers=API_KEY)
+    assert response.status_code == 422
+    response = upload(client, "json", b"")
+    assert response.status_code == 400
+    response = client.post("/api/books/bulk", content=b"x", headers={**API_KEY, "Content-Type": "text/plain"})
+    assert response.status_code == 422
+    assert "Неподдерживаемый формат" in response.json()["detail"][0]["msg"]
+
+
+def test_import_requires_key(client):
+    response = client.post("/api/books/bulk", json=BOOKS)
+    assert response.status_code in (401, 403)
+    assert stored(client) == []
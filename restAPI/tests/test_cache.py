@@ -0,0 +1,138 @@
+import asyncio
+import types
+from email.utils import formatdate
+
+import pytest
+
+import cache
+from conftest import API_KEY, add_books
+
+BOOK = {"title": "Мастер и Маргарита", "author": "Михаил Булгаков", "year": 1967}
+
+
+class Clock:
+    """Подменяемое время для модуля cache."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(1000.0)
+    monkeypatch.setattr(cache, "time", clock)
+    monkeypatch.setattr(cache, "cache", cache.MemoryCache())
+    return clock
+
+
+def respond(key, headers=None):
+    """Вызвать cached_response и вернуть ответ и число обращений к build."""
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return b'{"ok": true}', {}
+
+    request = types.SimpleNamespace(headers=headers or {})
+    return asyncio.run(cache.cached_response(request, key, build)), len(calls)
+
+
+def test_last_modified_is_time_of_write(clock):
+    asyncio.run(cache.invalidate())
+    clock.now = 2000.0
+    response, built = respond("book:1")
+    assert built == 1
+    assert response.headers["Last-Modified"] == formatdate(1000.0, usegmt=True)
+
+    # Запись устарела по TTL и собрана заново, но данные не менялись
+    clock.now = 2000.0 + 2 * cache.CACHE_TTL
+    response, built = respond("book:1")
+    assert built == 1
+    assert response.headers["Last-Modified"] == formatdate(1000.0, usegmt=True)
+
+    asyncio.run(cache.invalidate())
+    response, built = respond("book:1")
+    assert built == 1
+    assert response.headers["Last-Modified"] == formatdate(clock.now, usegmt=True)
+
+
+def test_last_modified_before_first_write_is_stable(clock):
+    first, _ = respond("book:1")
+    clock.now = 5000.0
+    second, built = respond("book:2")
+    assert built == 1
+    assert second.headers["Last-Modified"] == first.headers["Last-Modified"] == formatdate(1000.0, usegmt=True)
+
+
+def test_if_modified_since(clock):
+    asyncio.run(cache.invalidate())
+    response, _ = respond("book:1", {"if-modified-since": formatdate(1000.0, usegmt=True)})
+    assert response.status_code == 304
+    response, _ = respond("book:1", {"if-modified-since": formatdate(999.0, usegmt=True)})
+    assert response.status_code == 200
+    response, _ = respond("book:1", {"if-modified-since": "не дата"})
+    assert response.status_code == 200
+
+
+def test_etag_not_modified(client):
+    book_id, = add_books(client, [BOOK])
+    response = client.get(f"/api/books/{book_id}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    for tag in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(f"/api/books/{book_id}", headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    response = client.get(f"/api/books/{book_id}", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.json()["title"] == BOOK["title"]
+
+
+def test_if_none_match_wins_over_if_modified_since(client):
+    book_id, = add_books(client, [BOOK])
+    response = client.get(f"/api/books/{book_id}")
+    response = client.get(f"/api/books/{book_id}", headers={
+        "If-None-Match": '"other"', "If-Modified-Since": response.headers["Last-Modified"]})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("write", ["put", "patch", "delete", "create", "bulk"])
+def test_write_invalidates(client, write):
+    book_id, = add_books(client, [BOOK])
+    book_url = f"/api/books/{book_id}"
+    page = client.get("/api/books")
+    book = client.get(book_url)
+
+    if write == "put":
+        client.put(book_url, json={**BOOK, "title": "Белая гвардия"})
+    elif write == "patch":
+        client.patch(book_url, json={"title": "Белая гвардия"})
+    elif write == "delete":
+        client.delete(book_url)
+    elif write == "create":
+        add_books(client, [{**BOOK, "title": "Белая гвардия"}])
+    else:
+        client.post("/api/books/bulk", json=[{**BOOK, "title": "Белая гвардия"}], headers=API_KEY)
+
+    response = client.get("/api/books", headers={"If-None-Match": page.headers["ETag"]})
+    assert response.status_code == 200
+    assert "Белая гвардия" in response.text or write == "delete"
+    assert response.headers["ETag"] != page.headers["ETag"]
+
+    response = client.get(book_url, headers={"If-None-Match": book.headers["ETag"]})
+    if write in ("put", "patch"):
+        assert response.status_code == 200
+        assert response.json()["title"] == "Белая гвардия"
+    elif write == "delete":
+        assert response.status_code == 404
+    else:
+        # Книга не менялась: новое поколение, но то же тело и тот же ETag
+        assert response.status_code == 304
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from conftest import add_books
+
+BOOKS = [{"title": f"Книга {i}", "author": f"Автор {i % 4}", "year": 1900 + i} for i in range(23)]
+
+
+def walk(client, limit):
+    """Пройти все страницы по курсору X-Next-After; возвращает страницы ID."""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get("/api/books", params=params)
+        assert response.status_code == 200
+        pages.append([book["id"] for book in response.json()])
+        if "X-Next-After" not in response.headers:
+            return pages
+        params["after"] = int(response.headers["X-Next-After"])
+        assert params["after"] == pages[-1][-1]
+
+
+@pytest.mark.parametrize("limit", [1, 5, 23, 100])
+def test_keyset_pages_cover_every_row_once(client, limit):
+    ids = add_books(client, BOOKS)
+    pages = walk(client, limit)
+    seen = [book_id for page in pages for book_id in page]
+    assert seen == sorted(ids)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert len(pages[-1]) <= limit
+
+
+def test_pages_survive_deletes_between_requests(client):
+    ids = add_books(client, BOOKS)
+    first = client.get("/api/books", params={"limit": 10})
+    after = int(first.headers["X-Next-After"])
+    # Удаление уже выданных строк не сдвигает следующую страницу
+    for book_id in ids[:5]:
+        client.delete(f"/api/books/{book_id}")
+    second = client.get("/api/books", params={"limit": 10, "after": after})
+    assert [book["id"] for book in second.json()] == ids[10:20]
+
+
+def test_default_page_limit(client, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "PAGE_LIMIT", 7)
+    add_books(client, BOOKS)
+    response = client.get("/api/books")
+    assert len(response.json()) == 7
+    assert response.headers["X-Next-After"] == str(response.json()[-1]["id"])
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 1001}, {"after": -1}])
+def test_invalid_cursor(client, params):
+    assert client.get("/api/books", params=params).status_code == 422
+
+
+@pytest.mark.parametrize("params", [{}, {"after": 4}, {"after": 4, "limit": 6}, {"limit": 100}])
+def test_ndjson_stream_matches_pages(client, params):
+    add_books(client, BOOKS)
+    response = client.get("/api/books", params={**params, "stream": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+
+    expected = client.get("/api/books", params={"after": params.get("after", 0),
+                                                 "limit": params.get("limit", 1000)}).json()
+    assert streamed == expected
+
+
+def test_ndjson_stream_empty(client):
+    response = client.get("/api/books", params={"stream": True})
+    assert response.status_code == 200
+    assert response.text == ""
@@ -0,0 +1,107 @@
+import pytest
+
+from conftest import add_books
+from search import match_query
+
+BOOKS = [
+    {"title": "Мастер и Маргарита", "author": "Михаил Булгаков", "year": 1967},
+    {"title": "Белая гвардия", "author": "Михаил Булгаков", "year": 1925},
+    {"title": "Собачье сердце", "author": "Михаил Булгаков", "year": 1925},
+    {"title": "Война и мир", "author": "Лев Толстой", "year": 1869},
+    {"title": "Анна Каренина", "author": "Лев Толстой", "year": 1878},
+    {"title": "Мастерская", "author": "Ирина Иванова", "year": 2001},
+]
+
+
+def search(client, q, **params):
+    response = client.get("/api/books/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def titles(result):
+    return sorted(item["title"] for item in result["items"])
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("маст", '"маст"*'),
+    ("Мастер Маргарита", '"Мастер"* "Маргарита"*'),
+    ('мастер" OR автор:*', '"мастер"* "OR"* "автор"*'),
+    ("NEAR(a b) -x ^y", '"NEAR"* "a"* "b"* "x"* "y"*'),
+    ("*:()\"'", ""),
+])
+def test_match_query_quotes_words(q, expected):
+    assert match_query(q) == expected
+
+
+def test_prefix_match(client):
+    add_books(client, BOOKS)
+    assert titles(search(client, "маст")) == ["Мастер и Маргарита", "Мастерская"]
+    assert titles(search(client, "булг серд")) == ["Собачье сердце"]
+    assert search(client, "толст")["total"] == 2
+    # Слова из названия и автора ищутся вместе, все слова обязательны
+    assert titles(search(client, "мастер михаил")) == ["Мастер и Маргарита"]
+    assert search(client, "мастер толстой")["total"] == 0
+
+
+def test_operators_are_plain_words(client):
+    add_books(client, BOOKS)
+    assert search(client, 'мир OR "сердце')["total"] == 0
+    assert search(client, "()*")["total"] == 0
+    assert titles(search(client, "title:война")) == []
+    assert titles(search(client, "война-и-мир")) == ["Война и мир"]
+
+
+def test_title_weighs_more_than_author(client):
+    add_books(client, [{"title": "Иванов", "author": "Антон Чехов", "year": 1887}, *BOOKS])
+    items = search(client, "иван")["items"]
+    assert [item["title"] for item in items] == ["Иванов", "Мастерская"]
+    assert items[0]["score"] <= items[1]["score"]
+
+
+def test_fts_follows_update_and_delete(client):
+    ids = add_books(client, BOOKS)
+    client.patch(f"/api/books/{ids[0]}", json={"title": "Роман о дьяволе"})
+    assert titles(search(client, "маргарита")) == []
+    assert titles(search(client, "дьявол")) == ["Роман о дьяволе"]
+
+    client.put(f"/api/books/{ids[3]}", json={**BOOKS[3], "author": "Л. Н. Толстой"})
+    assert titles(search(client, "лев")) == ["Анна Каренина"]
+    assert search(client, "война")["items"][0]["author"] == "Л. Н. Толстой"
+
+    # Изменение года не трогает индекс, но видно в результатах
+    client.patch(f"/api/books/{ids[4]}", json={"year": 1877})
+    assert search(client, "анна")["items"][0]["year"] == 1877
+
+    client.delete(f"/api/books/{ids[5]}")
+    assert titles(search(client, "маст")) == []
+    assert search(client, "булгаков")["total"] == 3
+
+
+def test_facets(client):
+    add_books(client, BOOKS)
+    result = search(client, "михаил")
+    assert result["total"] == 3
+    assert result["facets"] == {"author": {"Михаил Булгаков": 3}, "year": {"1925": 2, "1967": 1}}
+
+    # Фасеты упорядочены по убыванию числа книг, при равенстве - по значению
+    result = search(client, "м")
+    assert list(result["facets"]["author"].items()) == [
+        ("Михаил Булгаков", 3), ("Ирина Иванова", 1), ("Лев Толстой", 1)]
+
+
+def test_facet_filters_and_paging(client):
+    add_books(client, BOOKS)
+    assert titles(search(client, "михаил", year=1925)) == ["Белая гвардия", "Собачье сердце"]
+    assert titles(search(client, "маст", author="Ирина Иванова")) == ["Мастерская"]
+
+    first = search(client, "михаил", limit=2)
+    second = search(client, "михаил", limit=2, offset=2)
+    assert first["total"] == second["total"] == 3
+    assert len(first["items"]) == 2 and len(second["items"]) == 1
+    assert {item["id"] for item in first["items"]}.isdisjoint(item["id"] for item in second["items"])
+
+
+def test_empty_query(client):
+    assert client.get("/api/books/search", params={"q": ""}).status_code == 422
+    assert search(client, "!!!") == {"total": 0, "items": [], "facets": {"author": {}, "year": {}}}
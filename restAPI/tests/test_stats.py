@@ -0,0 +1,63 @@
+import sqlite3
+
+from conftest import API_KEY, DB_PATH
+
+BOOKS = [
+    {"title": "Мастер и Маргарита", "author": "Михаил Булгаков", "year": 1967, "isbn": "9785170123456"},
+    {"title": "Белая гвардия", "author": "Михаил Булгаков", "year": 1925},
+    {"title": "Война и мир", "author": "Лев Толстой", "year": 1869},
+]
+
+
+def recount():
+    """Статистика, пересчитанная по таблице книг агрегатами GROUP BY."""
+    with sqlite3.connect(DB_PATH) as conn:
+        authors = dict(conn.execute("SELECT author, count(*) FROM books GROUP BY author"))
+        centuries = dict(conn.execute("SELECT year / 100 + 1, count(*) FROM books GROUP BY year / 100 + 1"))
+    return {
+        "total_books": sum(authors.values()),
+        "books_by_author": authors,
+        "books_by_century": {f"{century} век": count for century, count in sorted(centuries.items())},
+    }
+
+
+def test_counters_match_recount(client):
+    def check():
+        assert client.get("/api/book/stats").json() == recount()
+
+    ids = []
+    for book in BOOKS:
+        response = client.post("/api/books", json=book, headers=API_KEY)
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+        check()
+
+    # Полная замена меняет и автора, и век
+    response = client.put(f"/api/books/{ids[2]}", json={**BOOKS[2], "author": "Л. Н. Толстой", "year": 1901})
+    assert response.status_code == 200
+    check()
+    assert "Лев Толстой" not in client.get("/api/book/stats").json()["books_by_author"]
+
+    for patch in ({"author": "М. А. Булгаков"}, {"year": 2001}, {"title": "Мастер"},
+                  {"author": "Михаил Булгаков", "year": 1966}):
+        assert client.patch(f"/api/books/{ids[0]}", json=patch).status_code == 200
+        check()
+
+    # Неудачное изменение (занятый ISBN) откатывается вместе со счётчиками
+    response = client.patch(f"/api/books/{ids[1]}", json={"isbn": BOOKS[0]["isbn"], "author": "Другой"})
+    assert response.status_code == 409
+    check()
+
+    for book_id in ids:
+        assert client.delete(f"/api/books/{book_id}").status_code == 204
+        check()
+    assert client.get("/api/book/stats").json() == {"total_books": 0, "books_by_author": {}, "books_by_century": {}}
+
+
+def test_bulk_counters_match_recount(client):
+    client.post("/api/books/bulk", json=BOOKS, headers=API_KEY)
+    assert client.get("/api/book/stats").json() == recount()
+
+    changed = [{**BOOKS[0], "author": "М. А. Булгаков", "year": 1890}]
+    client.post("/api/books/bulk", params={"mode": "upsert"}, json=changed, headers=API_KEY)
+    assert client.get("/api/book/stats").json() == recount()